@@ -0,0 +1,221 @@
+"""
+Polling benchmarks for Anjun Express.
+
+Runs the real API client, coordinator and entities against the local stub
+server for several package counts and prints requests per second, refresh
+wall time, per-entity state compute time and memory per package.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import logging
+import tempfile
+import time
+import tracemalloc
+from types import MappingProxyType
+
+import aiohttp
+from anjun_express.api import AnjunExpressApiClient
+from anjun_express.binary_sensor import (
+    ENTITY_DESCRIPTIONS as BINARY_SENSOR_DESCRIPTIONS,
+)
+from anjun_express.binary_sensor import AnjunExpressBinarySensor
+from anjun_express.const import (
+    CONF_PACKAGE_NAME,
+    CONF_TRACKING_NUMBER,
+    DOMAIN,
+    LOGGER,
+    MAX_CONCURRENT_REQUESTS,
+)
+from anjun_express.coordinator import AnjunExpressDataUpdateCoordinator
+from anjun_express.data import AnjunExpressData
+from anjun_express.hub import async_get_hub
+from anjun_express.sensor import ENTITY_DESCRIPTIONS as SENSOR_DESCRIPTIONS
+from anjun_express.sensor import AnjunExpressSensor
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from stub_server import StubOptions, start_server
+
+STATE_ROUNDS = 20
+UNLIMITED_RATE = 1_000_000  # requests per second
+
+
+def _create_entry(tracking_number: str) -> ConfigEntry:
+    """Create a config entry for a package."""
+    return ConfigEntry(
+        data={
+            CONF_TRACKING_NUMBER: tracking_number,
+            CONF_PACKAGE_NAME: f"Package {tracking_number}",
+        },
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options={},
+        source="user",
+        title=f"Package {tracking_number}",
+        unique_id=tracking_number,
+        version=1,
+    )
+
+
+async def _refresh(
+    client: AnjunExpressApiClient,
+    coordinators: dict[str, AnjunExpressDataUpdateCoordinator],
+    concurrency: int,
+) -> float:
+    """Refresh every coordinator the way the hub does and return the time."""
+    started = time.perf_counter()
+    async for tracking_number, result in client.async_get_tracking_data_bulk(
+        coordinators, concurrency
+    ):
+        await coordinators[tracking_number].async_set_fetch_result(result)
+    return time.perf_counter() - started
+
+
+def _state_compute_time(entities: list) -> float:
+    """Return the mean time to compute the state of one entity."""
+    started = time.perf_counter()
+    for _ in range(STATE_ROUNDS):
+        for entity in entities:
+            if isinstance(entity, AnjunExpressSensor):
+                _ = entity.native_value, entity.extra_state_attributes
+            else:
+                _ = entity.is_on
+    return (time.perf_counter() - started) / (STATE_ROUNDS * len(entities))
+
+
+def _create_coordinators(
+    hass: HomeAssistant,
+    client: AnjunExpressApiClient,
+    packages: int,
+) -> dict[str, AnjunExpressDataUpdateCoordinator]:
+    """Create a config entry and coordinator per package."""
+    coordinators = {}
+    for index in range(packages):
+        tracking_number = f"AJ{index:015d}"
+        entry = _create_entry(tracking_number)
+        coordinator = AnjunExpressDataUpdateCoordinator(
+            hass=hass,
+            logger=LOGGER,
+            name=DOMAIN,
+            config_entry=entry,
+            update_interval=None,
+            always_update=False,
+        )
+        entry.runtime_data = AnjunExpressData(
+            client=client,
+            coordinator=coordinator,
+            integration=None,
+        )
+        coordinators[tracking_number] = coordinator
+    return coordinators
+
+
+async def _run_case(
+    hass: HomeAssistant,
+    base_url: str,
+    packages: int,
+    concurrency: int,
+) -> dict[str, float]:
+    """Benchmark one package count."""
+    async with aiohttp.ClientSession() as session:
+        client = AnjunExpressApiClient(
+            session, base_url=base_url, rate_limit=UNLIMITED_RATE, cache_ttl=0
+        )
+        coordinators = _create_coordinators(hass, client, packages)
+        first = await _refresh(client, coordinators, concurrency)
+        # Recent results are not cached, so this pass measures revalidating
+        # and skipping unchanged payloads rather than cache hits
+        unchanged = await _refresh(client, coordinators, concurrency)
+
+        entities = [
+            entity_class(coordinator, description)
+            for coordinator in coordinators.values()
+            for entity_class, descriptions in (
+                (AnjunExpressSensor, SENSOR_DESCRIPTIONS),
+                (AnjunExpressBinarySensor, BINARY_SENSOR_DESCRIPTIONS),
+            )
+            for description in descriptions
+        ]
+        state_time = _state_compute_time(entities)
+
+        # Memory is traced on a separate pass, tracing slows everything down
+        del coordinators, entities
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        client = AnjunExpressApiClient(
+            session, base_url=base_url, rate_limit=UNLIMITED_RATE, cache_ttl=0
+        )
+        coordinators = _create_coordinators(hass, client, packages)
+        await _refresh(client, coordinators, concurrency)
+        memory = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+    return {
+        "packages": packages,
+        "requests_per_second": packages / first,
+        "refresh_seconds": first,
+        "unchanged_refresh_seconds": unchanged,
+        "entity_state_microseconds": state_time * 1_000_000,
+        "memory_per_package_kib": memory / packages / 1024,
+    }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    """Run every benchmark case."""
+    runner, base_url = await start_server(
+        StubOptions(
+            events=args.events,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            etag=args.etag,
+        )
+    )
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await async_get_hub(hass).cache.async_load()
+        try:
+            results = [
+                await _run_case(hass, base_url, packages, args.concurrency)
+                for packages in args.packages
+            ]
+        finally:
+            await hass.async_stop(force=True)
+            await runner.cleanup()
+
+    columns = (
+        ("packages", "packages", "{:>12}"),
+        ("requests_per_second", "req/s", "{:>12.1f}"),
+        ("refresh_seconds", "refresh s", "{:>12.3f}"),
+        ("unchanged_refresh_seconds", "unchanged s", "{:>12.3f}"),
+        ("entity_state_microseconds", "state us", "{:>12.2f}"),
+        ("memory_per_package_kib", "KiB/package", "{:>12.2f}"),
+    )
+    print("  ".join(f"{label:>12}" for _, label, _ in columns))  # noqa: T201
+    for result in results:
+        print(  # noqa: T201
+            "  ".join(fmt.format(result[key]) for key, _, fmt in columns)
+        )
+
+
+def main() -> None:
+    """Parse the command line and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--packages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--etag", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_REQUESTS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Local stand-in for the Anjun Express tracking endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import random
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from aiohttp import web
+
+TRACKING_ENDPOINT = "/tracking/get-tracking"
+
+STATUSES = (
+    "Objeto postado",
+    "Objeto em trânsito - por favor aguarde",
+    "Objeto recebido na unidade de distribuição",
+    "Objeto em fiscalização aduaneira",
+    "Objeto encaminhado para a unidade de destino",
+    "Objeto saiu para entrega ao destinatário",
+)
+ADDRESSES = (
+    "Shenzhen / CN",
+    "Curitiba / PR",
+    "São Paulo / SP",
+    "Cajamar / SP",
+    "Recife / PE",
+    "Parnamirim / RN",
+)
+
+
+@dataclass(slots=True)
+class StubOptions:
+    """Behaviour of the stub server."""
+
+    events: int = 20
+    latency: float = 0.0  # seconds
+    error_rate: float = 0.0  # fraction of requests answered with HTTP 500
+    etag: bool = False
+
+
+def build_payload(tracking_number: str, events: int) -> dict:
+    """Build a realistic get-tracking payload, stable per tracking number."""
+    rng = random.Random(tracking_number)  # noqa: S311
+    start = datetime(2025, 5, 1, tzinfo=UTC)
+    shipping_company = [
+        {
+            "date": (start + timedelta(hours=index * 7))
+            .isoformat()
+            .replace("+00:00", "Z"),
+            "status": STATUSES[min(index * len(STATUSES) // events, 5)],
+            "address": rng.choice(ADDRESSES),
+            "remark": rng.choice(("", "Aguardando processamento")),
+        }
+        for index in range(events)
+    ]
+    shipping_company.reverse()  # Latest first, like the real API
+    return {
+        "trackingNumber": tracking_number,
+        "shippingCompany": shipping_company,
+        "clCollectOrder": {
+            "collectDate": start.isoformat(),
+            "collectAddress": rng.choice(ADDRESSES),
+            "recipientName": "",
+        },
+        "extraField": "x" * 256,
+    }
+
+
+def create_app(options: StubOptions) -> web.Application:
+    """Create the stub application."""
+    app = web.Application()
+    bodies: dict[str, bytes] = {}
+    rng = random.Random(0)  # noqa: S311
+
+    async def _get_tracking(request: web.Request) -> web.Response:
+        if options.latency:
+            await asyncio.sleep(options.latency)
+        if rng.random() < options.error_rate:
+            return web.Response(status=500)
+
+        tracking_number = request.query["trackingNumber"]
+        if (body := bodies.get(tracking_number)) is None:
+            body = bodies[tracking_number] = web.json_response(
+                build_payload(tracking_number, options.events)
+            ).body
+
+        headers = {}
+        if options.etag:
+            etag = f'"{hashlib.md5(body).hexdigest()}"'  # noqa: S324
+            if request.headers.get("if-none-match") == etag:
+                return web.Response(status=304)
+            headers["etag"] = etag
+
+        return web.Response(body=body, content_type="application/json", headers=headers)
+
+    app.router.add_get(TRACKING_ENDPOINT, _get_tracking)
+    return app
+
+
+async def start_server(options: StubOptions) -> tuple[web.AppRunner, str]:
+    """Start the stub on a free local port and return its base URL."""
+    runner = web.AppRunner(create_app(options), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
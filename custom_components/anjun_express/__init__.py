@@ -7,25 +7,31 @@ https://github.com/custom/anjun-express
 
 from __future__ import annotations
 
-from datetime import timedelta
+import time
+from functools import partial
 from typing import TYPE_CHECKING
 
 from homeassistant.const import Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import discovery
 from homeassistant.loader import async_get_loaded_integration
+from homeassistant.util import dt as dt_util
 
-from .api import AnjunExpressApiClient
 from .const import (
     CONF_TRACKING_NUMBER,
-    DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
     LOGGER,
+    create_device_name,
 )
 from .coordinator import AnjunExpressDataUpdateCoordinator
-from .data import AnjunExpressData
+from .data import AnjunExpressData, get_notification_window, get_package_name
+from .hub import async_get_hub, get_retire_at
+from .services import async_setup_services
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import AnjunExpressConfigEntry
 
@@ -34,31 +40,73 @@ PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Anjun Express services and shared sensors."""
+    async_setup_services(hass)
+    # Shared by every entry, so opened once before any of them is set up
+    await async_get_hub(hass).analytics.async_load()
+    hass.async_create_task(
+        discovery.async_load_platform(hass, Platform.SENSOR, DOMAIN, {}, config)
+    )
+    return True
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: AnjunExpressConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
+    setup_started = time.perf_counter()
+
+    # Polling is driven by the shared hub, not by a per-entry timer
     coordinator = AnjunExpressDataUpdateCoordinator(
         hass=hass,
         logger=LOGGER,
         name=DOMAIN,
-        update_interval=timedelta(minutes=DEFAULT_UPDATE_INTERVAL),
+        update_interval=None,
+        always_update=False,
     )
+    hub = async_get_hub(hass)
     entry.runtime_data = AnjunExpressData(
-        client=AnjunExpressApiClient(
-            tracking_number=entry.data[CONF_TRACKING_NUMBER],
-            session=async_get_clientsession(hass),
-        ),
+        client=hub.client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    # Start from the cached payload and refresh it in the background
+    phase_started = time.perf_counter()
+    cached = await hub.cache.async_get(entry.data[CONF_TRACKING_NUMBER])
+    if cached is None:
+        await coordinator.async_config_entry_first_refresh()
+        coordinator.metrics.setup["first_refresh"] = time.perf_counter() - phase_started
+    else:
+        coordinator.async_restore_data(cached)
+        coordinator.metrics.setup["cache_restore"] = time.perf_counter() - phase_started
+    entry.async_on_unload(
+        partial(hub.aggregates.async_remove, coordinator.tracking_number)
+    )
+    entry.async_on_unload(
+        partial(hub.stall_detector.async_remove, coordinator.tracking_number)
+    )
+    entry.async_on_unload(partial(hub.client.forget, coordinator.tracking_number))
+    hub.notifier.async_set_window(entry.entry_id, get_notification_window(entry))
+    entry.async_on_unload(partial(hub.notifier.async_remove_window, entry.entry_id))
 
+    # Retired packages keep their final state but are no longer polled
+    if await hub.archive.async_get(entry.entry_id) is None:
+        entry.async_on_unload(
+            hub.async_register(coordinator, refresh_soon=cached is not None)
+        )
+
+    phase_started = time.perf_counter()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    coordinator.metrics.setup["forward_platforms"] = time.perf_counter() - phase_started
+    entry.async_on_unload(entry.add_update_listener(async_update_entry))
+
+    coordinator.metrics.setup["total"] = time.perf_counter() - setup_started
 
     return True
 
@@ -71,9 +119,42 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
-async def async_reload_entry(
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: AnjunExpressConfigEntry,
+) -> None:
+    """Forget the cached payload of a removed entry."""
+    hub = async_get_hub(hass)
+    await hub.cache.async_load()
+    hub.cache.async_remove(entry.data[CONF_TRACKING_NUMBER])
+
+
+async def async_update_entry(
     hass: HomeAssistant,
     entry: AnjunExpressConfigEntry,
 ) -> None:
-    """Reload config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Apply option changes to the live coordinator and device."""
+    coordinator = entry.runtime_data.coordinator
+
+    # Track a retired package again when its grace period was extended
+    hub = async_get_hub(hass)
+    retire_at = get_retire_at(coordinator)
+    if (retire_at is None or retire_at > dt_util.utcnow()) and (
+        await hub.archive.async_get(entry.entry_id)
+    ):
+        hub.archive.async_remove(entry.entry_id)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    hub.async_reschedule(coordinator)
+    hub.notifier.async_set_window(entry.entry_id, get_notification_window(entry))
+
+    package_name = get_package_name(entry)
+    hub.stall_detector.async_rename(coordinator.tracking_number, package_name)
+    if entry.title != package_name:
+        hass.config_entries.async_update_entry(entry, title=package_name)
+
+    device_registry = dr.async_get(hass)
+    device_name = create_device_name(package_name, coordinator.tracking_number)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)})
+    if device is not None and device.name != device_name:
+        device_registry.async_update_device(device.id, name=device_name)
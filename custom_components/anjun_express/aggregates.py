@@ -0,0 +1,111 @@
+"""Fleet-wide package aggregates for Anjun Express."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+
+from .classifier import TrackingStage
+from .helpers import LazyMinHeap, ListenerRegistry
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .model import TrackingSnapshot
+    from .stall import AnjunExpressStallDetector
+
+# Packages in these stages are no longer on their way
+FINAL_STAGES = frozenset({TrackingStage.DELIVERED, TrackingStage.RETURNED})
+
+
+class AnjunExpressAggregates(ListenerRegistry):
+    """
+    Keep counts and extremes over every package up to date.
+
+    Each package update only adjusts what it changed: stage counts move by
+    one and the oldest package lives in a heap with lazy deletion, so an
+    update costs O(log n) whatever the number of packages. Stalled packages
+    come from the stall detector.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        stall_detector: AnjunExpressStallDetector,
+    ) -> None:
+        """Initialize the aggregates."""
+        super().__init__()
+        self.hass = hass
+        self._stages: dict[str, TrackingStage | None] = {}
+        self._counts: Counter[TrackingStage] = Counter()
+        # First event of every package still on its way
+        self._started = LazyMinHeap()
+        self._stall_detector = stall_detector
+        stall_detector.async_add_listener(self.async_update_listeners)
+
+    @callback
+    def async_update(
+        self,
+        tracking_number: str,
+        snapshot: TrackingSnapshot | None,
+    ) -> None:
+        """Apply the latest snapshot of a package."""
+        stage = snapshot.stage if snapshot else None
+        changed = self._set_stage(tracking_number, stage)
+
+        started = None
+        if snapshot is not None and stage not in FINAL_STAGES and snapshot.events:
+            # Events are latest first
+            started = snapshot.events[-1].timestamp
+        changed |= self._set_started(tracking_number, started)
+
+        if changed:
+            self.async_update_listeners()
+
+    @callback
+    def async_remove(self, tracking_number: str) -> None:
+        """Forget a package that is no longer tracked."""
+        changed = self._set_stage(tracking_number, None)
+        changed |= self._set_started(tracking_number, None)
+        self._stages.pop(tracking_number, None)
+        if changed:
+            self.async_update_listeners()
+
+    @callback
+    def async_count(self, stage: TrackingStage) -> int:
+        """Return the number of packages in a stage."""
+        return self._counts[stage]
+
+    @callback
+    def async_oldest(self) -> tuple[datetime, str] | None:
+        """Return the start and tracking number of the oldest package on its way."""
+        return self._started.peek()
+
+    @callback
+    def async_stalled(self) -> set[str]:
+        """Return the tracking numbers of stalled packages."""
+        return self._stall_detector.async_stalled()
+
+    def _set_stage(self, tracking_number: str, stage: TrackingStage | None) -> bool:
+        """Move a package between stage counts."""
+        previous = self._stages.get(tracking_number)
+        if previous == stage:
+            return False
+        if previous is not None:
+            self._counts[previous] -= 1
+        if stage is not None:
+            self._counts[stage] += 1
+        self._stages[tracking_number] = stage
+        return True
+
+    def _set_started(self, tracking_number: str, started: datetime | None) -> bool:
+        """Update when a package on its way started."""
+        if self._started.get(tracking_number) == started:
+            return False
+        if started is None:
+            self._started.remove(tracking_number)
+        else:
+            self._started.set(tracking_number, started)
+        return True
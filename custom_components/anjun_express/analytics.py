@@ -0,0 +1,426 @@
+"""Long-term delivery analytics for Anjun Express."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from itertools import combinations
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .classifier import TrackingStage
+from .const import ANALYTICS_DATABASE, ANALYTICS_FLUSH_DELAY, LOGGER
+from .helpers import ListenerRegistry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from .model import TrackingEvent
+
+# Stages a delivery normally goes through, in order
+LIFECYCLE = (
+    TrackingStage.POSTED,
+    TrackingStage.IN_TRANSIT,
+    TrackingStage.CUSTOMS,
+    TrackingStage.OUT_FOR_DELIVERY,
+    TrackingStage.DELIVERED,
+)
+TRANSITIONS: tuple[tuple[TrackingStage, TrackingStage], ...] = tuple(
+    combinations(LIFECYCLE, 2)
+)
+_LIFECYCLE_INDEX = {stage: index for index, stage in enumerate(LIFECYCLE)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    tracking_number TEXT NOT NULL,
+    date TEXT NOT NULL,
+    status TEXT NOT NULL,
+    location TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    PRIMARY KEY (tracking_number, date, status, location)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS events_stage_timestamp ON events (stage, timestamp);
+CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp);
+CREATE TABLE IF NOT EXISTS stage_entries (
+    tracking_number TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    entered REAL NOT NULL,
+    PRIMARY KEY (tracking_number, stage)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS stage_entries_stage_entered
+    ON stage_entries (stage, entered);
+"""
+
+INSERT_EVENT = "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?)"
+UPSERT_STAGE_ENTRY = """
+INSERT INTO stage_entries VALUES (?, ?, ?)
+ON CONFLICT (tracking_number, stage)
+DO UPDATE SET entered = min(entered, excluded.entered)
+"""
+SELECT_TRANSITIONS = """
+SELECT b.entered - a.entered
+FROM stage_entries AS a
+JOIN stage_entries AS b USING (tracking_number)
+WHERE a.stage = ? AND b.stage = ? AND a.entered >= ? AND b.entered >= a.entered
+ORDER BY 1
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class TransitionStats:
+    """Durations between entering two stages, in seconds."""
+
+    from_stage: TrackingStage
+    to_stage: TrackingStage
+    count: int
+    median: float | None
+    p90: float | None
+
+    @classmethod
+    def from_sorted(
+        cls,
+        transition: tuple[TrackingStage, TrackingStage],
+        durations: list[float],
+    ) -> TransitionStats:
+        """Summarize sorted durations without sorting them again."""
+        if not durations:
+            return cls(transition[0], transition[1], 0, None, None)
+        count = len(durations)
+        middle = count // 2
+        return cls(
+            from_stage=transition[0],
+            to_stage=transition[1],
+            count=count,
+            median=(
+                durations[middle]
+                if count % 2
+                else (durations[middle - 1] + durations[middle]) / 2
+            ),
+            p90=durations[int(0.9 * (count - 1))],
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as exposed by the service."""
+        return {
+            "from": self.from_stage,
+            "to": self.to_stage,
+            "count": self.count,
+            "median": self.median,
+            "p90": self.p90,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryEstimate:
+    """Expected delivery time of a package."""
+
+    time: datetime
+    # Stage the estimate starts from and the deliveries it is based on
+    based_on: TrackingStage
+    samples: int
+
+
+class AnjunExpressAnalytics(ListenerRegistry):
+    """
+    Keep every tracking event in a local SQLite database.
+
+    The time each package first entered each stage is also kept in memory,
+    with the sorted durations of every stage transition, so statistics are
+    updated per event and read without touching the database. When the
+    database cannot be opened the analytics stay disabled and empty.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the analytics store."""
+        super().__init__()
+        self.hass = hass
+        self._path = hass.config.path(STORAGE_DIR, ANALYTICS_DATABASE)
+        self._connection: sqlite3.Connection | None = None
+        # Only one executor job uses the connection at a time
+        self._db_lock = threading.Lock()
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self._enabled = False
+        self._entered: dict[str, dict[TrackingStage, float]] = {}
+        self._durations: dict[tuple[TrackingStage, TrackingStage], list[float]] = {
+            transition: [] for transition in TRANSITIONS
+        }
+        self._pending_events: list[tuple[str, str, str, str, str, float]] = []
+        self._pending_entries: dict[tuple[str, TrackingStage], float] = {}
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        """Open the database and load the stage entries once."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                rows = await self.hass.async_add_executor_job(self._open)
+            except (sqlite3.Error, OSError) as exception:
+                LOGGER.error(
+                    "Delivery analytics are disabled, cannot open %s: %s",
+                    self._path,
+                    exception,
+                )
+                return
+            for tracking_number, stage, entered in rows:
+                if stage in _LIFECYCLE_INDEX:
+                    self._entered.setdefault(tracking_number, {})[
+                        TrackingStage(stage)
+                    ] = entered
+            for entered in self._entered.values():
+                for transition, duration in _transition_durations(entered):
+                    self._durations[transition].append(duration)
+            for durations in self._durations.values():
+                durations.sort()
+            self._enabled = True
+            self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_shutdown
+            )
+
+    @callback
+    def async_knows(self, tracking_number: str) -> bool:
+        """Return whether events of a package were recorded."""
+        return tracking_number in self._entered
+
+    @callback
+    def async_record(
+        self,
+        tracking_number: str,
+        events: Iterable[TrackingEvent],
+    ) -> None:
+        """Record tracking events and update the statistics."""
+        if not self._enabled:
+            return
+        self._entered.setdefault(tracking_number, {})
+        timed = sorted(
+            (event for event in events if event.timestamp is not None),
+            key=lambda event: event.timestamp,
+        )
+        if not timed:
+            return
+
+        changed = False
+        for event in timed:
+            timestamp = event.timestamp.timestamp()
+            self._pending_events.append(
+                (
+                    tracking_number,
+                    event.date or "",
+                    event.status or "",
+                    event.location or "",
+                    event.stage,
+                    timestamp,
+                )
+            )
+            changed |= self._enter_stage(tracking_number, event.stage, timestamp)
+
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, ANALYTICS_FLUSH_DELAY, self._async_flush
+            )
+        if changed:
+            self.async_update_listeners()
+
+    def _enter_stage(
+        self,
+        tracking_number: str,
+        stage: TrackingStage,
+        timestamp: float,
+    ) -> bool:
+        """Move the entry time of a stage and its transition durations."""
+        if stage not in _LIFECYCLE_INDEX:
+            return False
+        entered = self._entered.setdefault(tracking_number, {})
+        previous = entered.get(stage)
+        if previous is not None and previous <= timestamp:
+            return False
+
+        for other, other_entered in entered.items():
+            if other is stage:
+                continue
+            if _LIFECYCLE_INDEX[other] < _LIFECYCLE_INDEX[stage]:
+                transition = (other, stage)
+                old = None if previous is None else previous - other_entered
+                new = timestamp - other_entered
+            else:
+                transition = (stage, other)
+                old = None if previous is None else other_entered - previous
+                new = other_entered - timestamp
+            durations = self._durations[transition]
+            if old is not None and old >= 0:
+                del durations[bisect_left(durations, old)]
+            if new >= 0:
+                insort(durations, new)
+
+        entered[stage] = timestamp
+        self._pending_entries[tracking_number, stage] = timestamp
+        return True
+
+    @callback
+    def async_get_stats(
+        self,
+        from_stage: TrackingStage,
+        to_stage: TrackingStage,
+    ) -> TransitionStats:
+        """Return the statistics of one stage transition."""
+        transition = (from_stage, to_stage)
+        return TransitionStats.from_sorted(transition, self._durations[transition])
+
+    @callback
+    def async_get_all_stats(self) -> list[TransitionStats]:
+        """Return the statistics of every stage transition."""
+        return [
+            TransitionStats.from_sorted(transition, durations)
+            for transition, durations in self._durations.items()
+        ]
+
+    @callback
+    def async_estimate_delivery(
+        self,
+        tracking_number: str,
+    ) -> DeliveryEstimate | None:
+        """Estimate the delivery from the latest stage with past deliveries."""
+        if not (entered := self._entered.get(tracking_number)):
+            return None
+        if (delivered := entered.get(TrackingStage.DELIVERED)) is not None:
+            return DeliveryEstimate(
+                datetime.fromtimestamp(delivered, UTC), TrackingStage.DELIVERED, 0
+            )
+
+        for stage in reversed(LIFECYCLE[:-1]):
+            if stage not in entered:
+                continue
+            stats = self.async_get_stats(stage, TrackingStage.DELIVERED)
+            if stats.median is None:
+                continue
+            return DeliveryEstimate(
+                time=datetime.fromtimestamp(entered[stage], UTC)
+                + timedelta(seconds=stats.median),
+                based_on=stage,
+                samples=stats.count,
+            )
+        return None
+
+    async def async_query_stats(self, since: datetime) -> list[TransitionStats]:
+        """Return the statistics of packages that entered a stage since then."""
+        await self._async_write_pending()
+        try:
+            return await self.hass.async_add_executor_job(
+                self._query_stats, since.timestamp()
+            )
+        except sqlite3.Error as exception:
+            msg = f"Cannot read the delivery analytics: {exception}"
+            raise HomeAssistantError(msg) from exception
+
+    @callback
+    def _async_flush(self, _now: datetime) -> None:
+        """Write the pending rows in the background."""
+        self._unsub_flush = None
+        self.hass.async_create_background_task(
+            self._async_write_pending(), f"{ANALYTICS_DATABASE} flush"
+        )
+
+    async def _async_write_pending(self) -> None:
+        """Write the pending rows in one transaction."""
+        events, self._pending_events = self._pending_events, []
+        entries, self._pending_entries = self._pending_entries, {}
+        if not events and not entries:
+            return
+        try:
+            await self.hass.async_add_executor_job(self._write, events, entries)
+        except sqlite3.Error as exception:
+            LOGGER.error("Cannot write the delivery analytics: %s", exception)
+
+    async def _async_shutdown(self, _event: Event) -> None:
+        """Write what is pending and close the database."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self._async_write_pending()
+        await self.hass.async_add_executor_job(self._close)
+
+    def _open(self) -> list[tuple[str, str, float]]:
+        """Create the database if needed and return the stage entries."""
+        Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+        with self._db_lock:
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(SCHEMA)
+                rows = connection.execute(
+                    "SELECT tracking_number, stage, entered FROM stage_entries"
+                ).fetchall()
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+            return rows
+
+    def _write(
+        self,
+        events: list[tuple[str, str, str, str, str, float]],
+        entries: dict[tuple[str, TrackingStage], float],
+    ) -> None:
+        """Append events and stage entries."""
+        with self._db_lock:
+            if self._connection is None:
+                return
+            with self._connection:
+                self._connection.executemany(INSERT_EVENT, events)
+                self._connection.executemany(
+                    UPSERT_STAGE_ENTRY,
+                    (
+                        (tracking_number, stage, entered)
+                        for (tracking_number, stage), entered in entries.items()
+                    ),
+                )
+
+    def _query_stats(self, since: float) -> list[TransitionStats]:
+        """Compute the statistics of recent packages with the stage index."""
+        with self._db_lock:
+            if self._connection is None:
+                return []
+            return [
+                TransitionStats.from_sorted(
+                    transition,
+                    [
+                        duration
+                        for (duration,) in self._connection.execute(
+                            SELECT_TRANSITIONS, (*transition, since)
+                        )
+                    ],
+                )
+                for transition in TRANSITIONS
+            ]
+
+    def _close(self) -> None:
+        """Close the database."""
+        with self._db_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def _transition_durations(
+    entered: dict[TrackingStage, float],
+) -> Iterator[tuple[tuple[TrackingStage, TrackingStage], float]]:
+    """Return the transition durations of one package."""
+    for transition in TRANSITIONS:
+        from_stage, to_stage = transition
+        if from_stage in entered and to_stage in entered:
+            duration = entered[to_stage] - entered[from_stage]
+            if duration >= 0:
+                yield transition, duration
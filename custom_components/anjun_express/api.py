@@ -2,16 +2,70 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import socket
-from typing import Any
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
 import async_timeout
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
-from .const import API_BASE_URL, API_TRACKING_ENDPOINT
+from .const import (
+    API_BASE_URL,
+    API_CACHE_SIZE,
+    API_CACHE_TTL,
+    API_TIMEOUT,
+    API_TRACKING_ENDPOINT,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_RESET_TIMEOUT,
+    CIRCUIT_RESET_TIMEOUT,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_RETRIES,
+    MAX_RETRY_AFTER,
+    MAX_RETRY_DELAY,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PER_SECOND,
+    RETRY_BACKOFF_BASE,
+)
+from .throttle import CircuitBreaker, CircuitState, TokenBucket, backoff_delay
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable
 
 # HTTP status codes
+HTTP_NOT_MODIFIED = 304
 HTTP_NOT_FOUND = 404
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVER_ERROR = 500
+
+READ_CHUNK_SIZE = 16 * 1024
+
+# Fields of each tracking event the integration consumes
+TRACKING_EVENT_FIELDS = ("date", "status", "address", "remark")
+
+TRACKING_HEADERS = {
+    "accept": "application/json, text/plain, */*",
+    "accept-language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+    "dnt": "1",
+    "origin": "https://anjunexpress.com.br",
+    "priority": "u=1, i",
+    "referer": "https://anjunexpress.com.br/",
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-site",
+    "user-agent": (
+        "Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) "
+        "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 "
+        "Mobile/15E148 Safari/604.1 Edg/136.0.0.0"
+    ),
+}
 
 
 class AnjunExpressApiClientError(Exception):
@@ -26,70 +80,368 @@ class AnjunExpressApiClientTrackingNotFoundError(AnjunExpressApiClientError):
     """Exception to indicate tracking number not found."""
 
 
+class AnjunExpressApiClientUnavailableError(AnjunExpressApiClientCommunicationError):
+    """Exception to indicate the API is rate limiting or failing."""
+
+    def __init__(self, msg: str, retry_after: float | None = None) -> None:
+        """Initialize the error with the delay asked by the server."""
+        super().__init__(msg)
+        self.retry_after = retry_after
+
+
+class AnjunExpressApiClientCircuitOpenError(AnjunExpressApiClientCommunicationError):
+    """Exception to indicate requests are held after repeated failures."""
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not (value := (value or "").strip()):
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    # A -0000 zone parses as a naive time, still meant as UTC
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max((retry_at - dt_util.utcnow()).total_seconds(), 0.0)
+
+
+def _project_tracking_payload(payload: Any) -> dict[str, Any]:
+    """Keep only the parts of a get-tracking payload the integration uses."""
+    if not isinstance(payload, dict):
+        msg = "Unexpected tracking payload"
+        raise AnjunExpressApiClientError(msg)
+
+    events = payload.get("shippingCompany")
+    collect_order = payload.get("clCollectOrder")
+    return {
+        "shippingCompany": [
+            {field: event.get(field) for field in TRACKING_EVENT_FIELDS}
+            for event in (events if isinstance(events, list) else ())
+            if isinstance(event, dict)
+        ],
+        "clCollectOrder": {
+            key: value
+            for key, value in (
+                collect_order.items() if isinstance(collect_order, dict) else ()
+            )
+            if value and isinstance(value, str | int | float)
+        },
+    }
+
+
+def _conditional_headers(
+    headers: dict | None,
+    cached: _CachedResponse | None,
+) -> dict | None:
+    """Add the validators of a cached response, to revalidate it."""
+    if cached is None or not (cached.etag or cached.last_modified):
+        return headers
+    headers = dict(headers or {})
+    if cached.etag:
+        headers["if-none-match"] = cached.etag
+    if cached.last_modified:
+        headers["if-modified-since"] = cached.last_modified
+    return headers
+
+
+def _decode_payload(
+    chunks: list[bytes],
+    project: Callable[[Any], Any] | None,
+) -> Any:
+    """Decode a JSON body and keep only what the caller uses."""
+    try:
+        decoded = json_loads(b"".join(chunks))
+        # Drop unused fields before anything holds on to the payload
+        if project is not None:
+            decoded = project(decoded)
+    except (AttributeError, TypeError, ValueError) as exception:
+        msg = f"Something really wrong happened! - {exception}"
+        raise AnjunExpressApiClientError(msg) from exception
+    return decoded
+
+
 def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
     """Verify that the response is valid."""
     if response.status == HTTP_NOT_FOUND:
         msg = "Tracking number not found"
         raise AnjunExpressApiClientTrackingNotFoundError(msg)
+    if (
+        response.status == HTTP_TOO_MANY_REQUESTS
+        or response.status >= HTTP_SERVER_ERROR
+    ):
+        msg = f"Anjun Express API unavailable - HTTP {response.status}"
+        raise AnjunExpressApiClientUnavailableError(
+            msg, _parse_retry_after(response.headers.get("retry-after"))
+        )
     response.raise_for_status()
 
 
+@dataclass(frozen=True, slots=True)
+class _ApiRequest:
+    """A request to send, with how to cache and trim its response."""
+
+    method: str
+    url: str
+    data: dict | None = None
+    headers: dict | None = None
+    params: dict | None = None
+    cache_key: str | None = None
+    project: Callable[[Any], Any] | None = None
+
+
+@dataclass(slots=True)
+class _CachedResponse:
+    """Validators and decoded body of the last response for a request."""
+
+    digest: bytes
+    data: Any
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """Measurements of the last request sent for a cache key."""
+
+    latency: float
+    payload_size: int
+    decode_time: float
+    unchanged: bool
+
+
+class _TtlLruCache:
+    """Small cache of recent results, bounded in age and size."""
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        """Initialize the cache."""
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        """Return a fresh cached value."""
+        if (entry := self._entries.get(key)) is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Cache a value, evicting the least recently used one when full."""
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        """Drop a cached value."""
+        self._entries.pop(key, None)
+
+
 class AnjunExpressApiClient:
     """Anjun Express API Client."""
 
     def __init__(
         self,
-        tracking_number: str,
         session: aiohttp.ClientSession,
+        *,
+        base_url: str = API_BASE_URL,
+        rate_limit: float = RATE_LIMIT_PER_SECOND,
+        cache_ttl: float = API_CACHE_TTL,
     ) -> None:
         """Initialize the API Client."""
-        self._tracking_number = tracking_number
         self._session = session
+        self._tracking_url = f"{base_url}{API_TRACKING_ENDPOINT}"
+        self._responses: dict[str, _CachedResponse] = {}
+        self._stats: dict[str, RequestStats] = {}
+        self._recent = _TtlLruCache(cache_ttl, API_CACHE_SIZE)
+        self._in_flight: dict[str, asyncio.Task[dict[str, Any]]] = {}
+        self._rate_limiter = TokenBucket(rate_limit, RATE_LIMIT_BURST, MAX_RETRY_AFTER)
+        self._circuit_breaker = CircuitBreaker(
+            CIRCUIT_FAILURE_THRESHOLD,
+            CIRCUIT_RESET_TIMEOUT,
+            CIRCUIT_MAX_RESET_TIMEOUT,
+        )
+
+    @property
+    def circuit_state(self) -> CircuitState:
+        """Return the state of the circuit breaker."""
+        return self._circuit_breaker.state
+
+    def get_request_stats(self, tracking_number: str) -> RequestStats | None:
+        """Return the measurements of the last request for a tracking number."""
+        return self._stats.get(tracking_number)
+
+    def forget(self, tracking_number: str) -> None:
+        """Drop what is kept about a tracking number that is no longer polled."""
+        self._responses.pop(tracking_number, None)
+        self._stats.pop(tracking_number, None)
+        self._recent.pop(tracking_number)
+
+    async def async_get_tracking_data(self, tracking_number: str) -> dict[str, Any]:
+        """
+        Get tracking data from the API.
 
-    async def async_get_tracking_data(self) -> dict[str, Any]:
-        """Get tracking data from the API."""
-        return await self._api_wrapper(
-            method="get",
-            url=f"{API_BASE_URL}{API_TRACKING_ENDPOINT}",
-            params={"trackingNumber": self._tracking_number},
-            headers={
-                "accept": "application/json, text/plain, */*",
-                "accept-language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-                "dnt": "1",
-                "origin": "https://anjunexpress.com.br",
-                "priority": "u=1, i",
-                "referer": "https://anjunexpress.com.br/",
-                "sec-fetch-dest": "empty",
-                "sec-fetch-mode": "cors",
-                "sec-fetch-site": "same-site",
-                "user-agent": (
-                    "Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) "
-                    "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 "
-                    "Mobile/15E148 Safari/604.1 Edg/136.0.0.0"
-                ),
-            },
+        When nothing changed since the previous call the very same object is
+        returned, so callers can skip their work with an identity check.
+        Concurrent calls for a tracking number share one request and results
+        are reused for a short while.
+        """
+        if (data := self._recent.get(tracking_number)) is not None:
+            return data
+
+        if (task := self._in_flight.get(tracking_number)) is None:
+            task = self._in_flight[tracking_number] = asyncio.create_task(
+                self._async_fetch_tracking_data(tracking_number)
+            )
+            task.add_done_callback(
+                lambda done: self._request_done(tracking_number, done)
+            )
+
+        # Cancelling one caller must not cancel the request the others await
+        return await asyncio.shield(task)
+
+    def _request_done(self, tracking_number: str, task: asyncio.Task) -> None:
+        """Forget a finished request."""
+        self._in_flight.pop(tracking_number, None)
+        # Callers report errors, do not let asyncio log them again
+        if not task.cancelled():
+            task.exception()
+
+    async def _async_fetch_tracking_data(
+        self,
+        tracking_number: str,
+    ) -> dict[str, Any]:
+        """Fetch tracking data and remember it for a short while."""
+        data = await self._api_wrapper(
+            _ApiRequest(
+                method="get",
+                url=self._tracking_url,
+                cache_key=tracking_number,
+                params={"trackingNumber": tracking_number},
+                headers=TRACKING_HEADERS,
+                project=_project_tracking_payload,
+            )
         )
+        self._recent.set(tracking_number, data)
+        return data
 
-    async def _api_wrapper(
+    async def async_get_tracking_data_bulk(
         self,
-        method: str,
-        url: str,
-        data: dict | None = None,
-        headers: dict | None = None,
-        params: dict | None = None,
-    ) -> Any:
-        """Get information from the API."""
+        tracking_numbers: Iterable[str],
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    ) -> AsyncIterator[tuple[str, dict[str, Any] | AnjunExpressApiClientError]]:
+        """
+        Get tracking data for many tracking numbers concurrently.
+
+        Results are yielded as soon as each request completes. Failures are
+        yielded as the exception instead of aborting the whole batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _fetch(
+            tracking_number: str,
+        ) -> tuple[str, dict[str, Any] | AnjunExpressApiClientError]:
+            async with semaphore:
+                try:
+                    return tracking_number, await self.async_get_tracking_data(
+                        tracking_number
+                    )
+                except AnjunExpressApiClientError as exception:
+                    return tracking_number, exception
+                except Exception as exception:  # noqa: BLE001
+                    # Keep the batch going, the caller reports it per package
+                    msg = f"Something really wrong happened! - {exception}"
+                    return tracking_number, AnjunExpressApiClientError(msg)
+
+        tasks = [
+            asyncio.create_task(_fetch(tracking_number))
+            for tracking_number in tracking_numbers
+        ]
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=data,
-                    params=params,
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _api_wrapper(self, request: _ApiRequest) -> Any:
+        """Get information from the API, retrying when it is unavailable."""
+        attempt = 0
+        while True:
+            # Retries belong to the request the breaker already let through
+            if attempt == 0 and not self._circuit_breaker.allow_request():
+                msg = (
+                    "Too many failed requests, retrying in "
+                    f"{self._circuit_breaker.retry_in:.0f}s"
+                )
+                raise AnjunExpressApiClientCircuitOpenError(msg)
+
+            if not await self._rate_limiter.async_acquire():
+                # Fail fast instead of queueing callers behind a long pause
+                retry_in = self._rate_limiter.paused_for
+                msg = f"Rate limited by the API, retrying in {retry_in:.0f}s"
+                raise AnjunExpressApiClientUnavailableError(msg, retry_in)
+            try:
+                result = await self._async_request(request)
+            except AnjunExpressApiClientUnavailableError as exception:
+                if exception.retry_after is not None:
+                    self._rate_limiter.pause(exception.retry_after)
+                delay = exception.retry_after or backoff_delay(
+                    attempt, RETRY_BACKOFF_BASE, MAX_RETRY_DELAY
                 )
+                if attempt == MAX_RETRIES or delay > MAX_RETRY_DELAY:
+                    # One failure per request, however many attempts it took
+                    self._circuit_breaker.record_failure()
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+            except AnjunExpressApiClientCommunicationError:
+                self._circuit_breaker.record_failure()
+                raise
+            except AnjunExpressApiClientError:
+                # The API answered, the request itself was the problem
+                self._circuit_breaker.record_success()
+                raise
+            else:
+                self._circuit_breaker.record_success()
+                return result
+
+    async def _async_request(self, request: _ApiRequest) -> Any:
+        """Send a single request."""
+        cache_key = request.cache_key
+        cached = self._responses.get(cache_key) if cache_key else None
+        started = time.perf_counter()
+        try:
+            async with (
+                async_timeout.timeout(API_TIMEOUT),
+                self._session.request(
+                    method=request.method,
+                    url=request.url,
+                    headers=_conditional_headers(request.headers, cached),
+                    json=request.data,
+                    params=request.params,
+                ) as response,
+            ):
+                if cached is not None and response.status == HTTP_NOT_MODIFIED:
+                    self._record_stats(cache_key, started, 0, 0.0, unchanged=True)
+                    return cached.data
+
                 _verify_response_or_raise(response)
-                return await response.json()
+
+                # Hash while the body streams in, no second pass over it
+                hasher = hashlib.blake2b(digest_size=16)
+                chunks = []
+                async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    chunks.append(chunk)
 
         except TimeoutError as exception:
             msg = f"Timeout error fetching information - {exception}"
@@ -97,6 +449,56 @@ class AnjunExpressApiClient:
         except (aiohttp.ClientError, socket.gaierror) as exception:
             msg = f"Error fetching information - {exception}"
             raise AnjunExpressApiClientCommunicationError(msg) from exception
+        except AnjunExpressApiClientError:
+            raise
         except Exception as exception:  # pylint: disable=broad-except
             msg = f"Something really wrong happened! - {exception}"
             raise AnjunExpressApiClientError(msg) from exception
+
+        payload_size = sum(map(len, chunks))
+
+        # Servers without validators still send identical bodies, skip decoding
+        digest = hasher.digest()
+        if cached is not None and cached.digest == digest:
+            cached.etag = response.headers.get("etag")
+            cached.last_modified = response.headers.get("last-modified")
+            self._record_stats(cache_key, started, payload_size, 0.0, unchanged=True)
+            return cached.data
+
+        decode_started = time.perf_counter()
+        decoded = _decode_payload(chunks, request.project)
+        del chunks
+        self._record_stats(
+            cache_key,
+            started,
+            payload_size,
+            time.perf_counter() - decode_started,
+            unchanged=False,
+        )
+
+        if cache_key:
+            self._responses[cache_key] = _CachedResponse(
+                digest=digest,
+                data=decoded,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+        return decoded
+
+    def _record_stats(
+        self,
+        cache_key: str | None,
+        started: float,
+        payload_size: int,
+        decode_time: float,
+        *,
+        unchanged: bool,
+    ) -> None:
+        """Remember the measurements of a request."""
+        if cache_key:
+            self._stats[cache_key] = RequestStats(
+                latency=time.perf_counter() - started,
+                payload_size=payload_size,
+                decode_time=decode_time,
+                unchanged=unchanged,
+            )
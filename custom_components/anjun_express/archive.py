@@ -0,0 +1,78 @@
+"""Archive of retired packages for Anjun Express."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_SAVE_DELAY, STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+    from .model import TrackingSnapshot
+
+
+class AnjunExpressArchive:
+    """Keep a compact summary of every retired package on disk."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the archive."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.archive"
+        )
+        self._packages: dict[str, Any] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Load the archive from disk once."""
+        async with self._load_lock:
+            if self._packages is None:
+                self._packages = await self._store.async_load() or {}
+
+    async def async_get(self, entry_id: str) -> dict[str, Any] | None:
+        """Return the summary of a retired entry."""
+        await self.async_load()
+        return self._packages.get(entry_id)
+
+    @callback
+    def async_add(
+        self,
+        entry_id: str,
+        tracking_number: str,
+        package_name: str,
+        snapshot: TrackingSnapshot,
+        retired_at: datetime,
+    ) -> None:
+        """Archive the final snapshot of a package and schedule a save."""
+        if self._packages is None:
+            return
+        latest = snapshot.latest
+        self._packages[entry_id] = {
+            "tracking_number": tracking_number,
+            "package_name": package_name,
+            "status": latest.status if latest else None,
+            "location": latest.location if latest else None,
+            "events": len(snapshot.events),
+            "delivered_at": (
+                snapshot.delivered_at.isoformat() if snapshot.delivered_at else None
+            ),
+            "retired_at": retired_at.isoformat(),
+        }
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget a retired entry, for example when it is tracked again."""
+        if self._packages and self._packages.pop(entry_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return self._packages or {}
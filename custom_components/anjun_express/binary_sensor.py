@@ -29,15 +29,6 @@ ENTITY_DESCRIPTIONS = (
     ),
 )
 
-# Status messages that indicate delivery
-DELIVERY_STATUSES = [
-    "entregue",
-    "delivered",
-    "objeto entregue",
-    "entrega realizada",
-    "package delivered",
-]
-
 
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
@@ -81,20 +72,12 @@ class AnjunExpressBinarySensor(AnjunExpressEntity, BinarySensorEntity):
         )
         self._attr_name = entity_name
 
+    def _state_fingerprint(self) -> bool:
+        """Return the value written to the state machine."""
+        return self.is_on
+
     @property
     def is_on(self) -> bool:
         """Return true if the package is delivered."""
-        if not self.coordinator.data or "shippingCompany" not in self.coordinator.data:
-            return False
-
-        shipping_events = self.coordinator.data.get("shippingCompany", [])
-        if not shipping_events:
-            return False
-
-        # Check if any event indicates delivery
-        for event in shipping_events:
-            status = event.get("status", "").lower()
-            if any(delivery_status in status for delivery_status in DELIVERY_STATUSES):
-                return True
-
-        return False
+        snapshot = self.coordinator.data
+        return snapshot is not None and snapshot.delivered
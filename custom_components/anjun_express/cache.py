@@ -0,0 +1,56 @@
+"""Persistent tracking cache for Anjun Express."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_SAVE_DELAY, STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+class AnjunExpressTrackingCache:
+    """Keep the last payload of every tracking number on disk."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.tracking"
+        )
+        self._payloads: dict[str, Any] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Load the cache from disk once."""
+        async with self._load_lock:
+            if self._payloads is None:
+                self._payloads = await self._store.async_load() or {}
+
+    async def async_get(self, tracking_number: str) -> Any | None:
+        """Return the cached payload of a tracking number."""
+        await self.async_load()
+        return self._payloads.get(tracking_number)
+
+    @callback
+    def async_set(self, tracking_number: str, payload: Any) -> None:
+        """Cache a payload and schedule a save."""
+        if self._payloads is None:
+            return
+        self._payloads[tracking_number] = payload
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, tracking_number: str) -> None:
+        """Drop a tracking number from the cache."""
+        if self._payloads and self._payloads.pop(tracking_number, None) is not None:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return self._payloads or {}
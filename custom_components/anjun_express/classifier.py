@@ -0,0 +1,105 @@
+"""Tracking status classification for Anjun Express."""
+
+from __future__ import annotations
+
+import re
+from enum import StrEnum
+from functools import cache, lru_cache
+
+
+class TrackingStage(StrEnum):
+    """Normalized lifecycle stage of a package."""
+
+    POSTED = "posted"
+    IN_TRANSIT = "in_transit"
+    CUSTOMS = "customs"
+    OUT_FOR_DELIVERY = "out_for_delivery"
+    DELIVERED = "delivered"
+    RETURNED = "returned"
+    EXCEPTION = "exception"
+
+
+# Keywords of every stage, highest priority first, so that "não entregue"
+# is an exception and not a delivery
+STAGE_KEYWORDS: dict[TrackingStage, tuple[str, ...]] = {
+    TrackingStage.EXCEPTION: (
+        "não entregue",
+        "nao entregue",
+        "tentativa de entrega",
+        "destinatário ausente",
+        "destinatario ausente",
+        "endereço incorreto",
+        "endereco incorreto",
+        "extraviado",
+        "recusado",
+        "delivery attempt",
+        "failed",
+        "exception",
+    ),
+    TrackingStage.RETURNED: (
+        "devolvido",
+        "devolução",
+        "devolucao",
+        "retorno ao remetente",
+        "returned",
+        "return to sender",
+    ),
+    TrackingStage.DELIVERED: (
+        "entregue",
+        "entrega realizada",
+        "delivered",
+    ),
+    TrackingStage.OUT_FOR_DELIVERY: (
+        "saiu para entrega",
+        "em rota de entrega",
+        "out for delivery",
+    ),
+    TrackingStage.CUSTOMS: (
+        "alfândega",
+        "alfandega",
+        "aduaneir",
+        "fiscalização",
+        "fiscalizacao",
+        "receita federal",
+        "tributação",
+        "tributacao",
+        "importação",
+        "importacao",
+        "customs",
+    ),
+    TrackingStage.POSTED: (
+        "postado",
+        "coletado",
+        "pedido criado",
+        "posted",
+        "collected",
+        "label created",
+        "order created",
+    ),
+}
+
+_STAGE_PRIORITY = {stage: priority for priority, stage in enumerate(STAGE_KEYWORDS)}
+
+
+@cache
+def _get_matcher() -> re.Pattern[str]:
+    """Compile one alternation for every keyword on first use."""
+    # The named group of a match tells the stage
+    return re.compile(
+        "|".join(
+            f"(?P<{stage.name}>{'|'.join(map(re.escape, keywords))})"
+            for stage, keywords in STAGE_KEYWORDS.items()
+        ),
+        re.IGNORECASE,
+    )
+
+
+@lru_cache(maxsize=1024)
+def classify_status(status: str) -> TrackingStage:
+    """Map a carrier status message to a lifecycle stage."""
+    stages = {
+        TrackingStage[match.lastgroup] for match in _get_matcher().finditer(status)
+    }
+    if not stages:
+        return TrackingStage.IN_TRANSIT
+    return min(stages, key=_STAGE_PRIORITY.__getitem__)
@@ -4,16 +4,29 @@ from __future__ import annotations
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api import (
-    AnjunExpressApiClient,
     AnjunExpressApiClientCommunicationError,
     AnjunExpressApiClientError,
     AnjunExpressApiClientTrackingNotFoundError,
 )
-from .const import CONF_PACKAGE_NAME, CONF_TRACKING_NUMBER, DOMAIN, LOGGER
+from .const import (
+    CONF_NOTIFICATION_WINDOW,
+    CONF_PACKAGE_NAME,
+    CONF_REMOVE_RETIRED,
+    CONF_RETIRE_AFTER,
+    CONF_TRACKING_NUMBER,
+    DEFAULT_NOTIFICATION_WINDOW,
+    DEFAULT_RETIRE_AFTER,
+    DOMAIN,
+    LOGGER,
+    MAX_NOTIFICATION_WINDOW,
+    MAX_RETIRE_AFTER,
+)
+from .data import get_package_name
+from .hub import async_get_hub
 
 
 class AnjunExpressFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -21,6 +34,14 @@ class AnjunExpressFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> AnjunExpressOptionsFlow:
+        """Get the options flow for this handler."""
+        return AnjunExpressOptionsFlow()
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
@@ -80,10 +101,82 @@ class AnjunExpressFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=_errors,
         )
 
+    async def async_step_import(
+        self,
+        import_data: dict,
+    ) -> config_entries.ConfigFlowResult:
+        """Create an entry for a package validated by the import service."""
+        await self.async_set_unique_id(
+            unique_id=import_data[CONF_TRACKING_NUMBER].upper()
+        )
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=import_data[CONF_PACKAGE_NAME],
+            data=import_data,
+        )
+
     async def _test_tracking_number(self, tracking_number: str) -> None:
         """Validate tracking number."""
-        client = AnjunExpressApiClient(
-            tracking_number=tracking_number,
-            session=async_create_clientsession(self.hass),
+        await async_get_hub(self.hass).client.async_get_tracking_data(tracking_number)
+
+
+class AnjunExpressOptionsFlow(config_entries.OptionsFlow):
+    """Options flow for Anjun Express."""
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the package options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_PACKAGE_NAME,
+                        default=get_package_name(self.config_entry),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_NOTIFICATION_WINDOW,
+                        default=self.config_entry.options.get(
+                            CONF_NOTIFICATION_WINDOW, DEFAULT_NOTIFICATION_WINDOW
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=MAX_NOTIFICATION_WINDOW,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_RETIRE_AFTER,
+                        default=self.config_entry.options.get(
+                            CONF_RETIRE_AFTER, DEFAULT_RETIRE_AFTER
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=MAX_RETIRE_AFTER,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="d",
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_REMOVE_RETIRED,
+                        default=self.config_entry.options.get(
+                            CONF_REMOVE_RETIRED, False
+                        ),
+                    ): selector.BooleanSelector(),
+                },
+            ),
         )
-        await client.async_get_tracking_data()
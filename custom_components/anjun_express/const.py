@@ -11,14 +11,80 @@ ATTRIBUTION = "Data provided by Anjun Express"
 # Configuration constants
 CONF_TRACKING_NUMBER = "tracking_number"
 CONF_PACKAGE_NAME = "package_name"
+CONF_NOTIFICATION_WINDOW = "notification_window"
+CONF_RETIRE_AFTER = "retire_after"
+CONF_REMOVE_RETIRED = "remove_retired"
 
 # API constants
 API_BASE_URL = "https://website-trackings.anjunexpress.com.br"
 API_TRACKING_ENDPOINT = "/tracking/get-tracking"
+API_TIMEOUT = 10  # seconds
+API_CACHE_TTL = 60  # seconds
+API_CACHE_SIZE = 256
+
+# API throttling
+RATE_LIMIT_PER_SECOND = 2
+RATE_LIMIT_BURST = 5
+MAX_RETRIES = 2
+RETRY_BACKOFF_BASE = 1  # seconds
+MAX_RETRY_DELAY = 30  # seconds
+MAX_RETRY_AFTER = 5 * 60  # seconds
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 60  # seconds
+CIRCUIT_MAX_RESET_TIMEOUT = 30 * 60  # seconds
 
 # Update interval
 DEFAULT_UPDATE_INTERVAL = 30  # minutes
 
+# Polling hub
+MAX_CONCURRENT_REQUESTS = 5
+HUB_TICK_INTERVAL = 1  # minutes
+RESTORE_REFRESH_WINDOW = 10  # minutes
+
+# Persistent cache
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30  # seconds
+
+# Event history
+HISTORY_ATTRIBUTE_LIMIT = 5  # events kept in the tracking_events attribute
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 500
+
+# Bulk import
+IMPORT_MAX_PACKAGES = 1000
+
+# Adaptive polling
+OUT_FOR_DELIVERY_UPDATE_INTERVAL = 10  # minutes
+DELIVERED_UPDATE_INTERVAL = 24 * 60  # minutes
+MAX_UPDATE_INTERVAL = 6 * 60  # minutes
+UPDATE_INTERVAL_JITTER = 0.1  # fraction of the interval
+
+# Notifications
+DEFAULT_NOTIFICATION_WINDOW = 30  # seconds
+MAX_NOTIFICATION_WINDOW = 10 * 60  # seconds
+EVENT_DIGEST = f"{DOMAIN}_digest"
+
+# Retiring delivered packages
+DEFAULT_RETIRE_AFTER = 7  # days after delivery, 0 never retires
+MAX_RETIRE_AFTER = 365  # days
+
+# Stall detection, hours without a new event per stage
+STALL_THRESHOLDS = {
+    "posted": 3 * 24,
+    "in_transit": 7 * 24,
+    "customs": 10 * 24,
+    "out_for_delivery": 24,
+    "exception": 2 * 24,
+}
+EVENT_STALLED = f"{DOMAIN}_stalled"
+
+# Delivery analytics
+ANALYTICS_DATABASE = f"{DOMAIN}.analytics.db"
+ANALYTICS_FLUSH_DELAY = 30  # seconds
+
+# Bus event fired for every new tracking event
+EVENT_TRACKING = f"{DOMAIN}_event"
+
 
 def create_entity_id(
     tracking_number: str, sensor_type: str
@@ -34,3 +100,8 @@ def create_entity_id(
 
     # Create entity ID
     return f"anjun_{clean_tracking_number}_{sensor_type}"
+
+
+def create_device_name(package_name: str, tracking_number: str) -> str:
+    """Create the device name of a package."""
+    return f"Anjun {package_name} ({tracking_number})"
@@ -2,95 +2,188 @@
 
 from __future__ import annotations
 
+import time
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.persistent_notification import async_create
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import AnjunExpressApiClientError
-from .const import CONF_PACKAGE_NAME, CONF_TRACKING_NUMBER
+from .const import (
+    CONF_TRACKING_NUMBER,
+    DOMAIN,
+    EVENT_TRACKING,
+)
+from .data import AnjunExpressMetrics, get_package_name
+from .diff import EventDiffer
+from .hub import async_get_hub
+from .model import TrackingEvent, TrackingSnapshot
 
 if TYPE_CHECKING:
     from .data import AnjunExpressConfigEntry
 
 
-class AnjunExpressDataUpdateCoordinator(DataUpdateCoordinator):
+class AnjunExpressDataUpdateCoordinator(DataUpdateCoordinator[TrackingSnapshot]):
     """Class to manage fetching data from the API."""
 
     config_entry: AnjunExpressConfigEntry
-    _previous_data: dict[str, Any] | None = None
 
-    async def _async_update_data(self) -> Any:
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the coordinator."""
+        super().__init__(*args, **kwargs)
+        # Events first seen by the latest refresh, latest first
+        self.new_events: list[TrackingEvent] = []
+        self._differ: EventDiffer | None = None
+        self._payload: dict[str, Any] | None = None
+        # The options flow cannot change the tracking number
+        self.tracking_number: str = self.config_entry.data[CONF_TRACKING_NUMBER]
+        self.metrics = AnjunExpressMetrics()
+        self._device_id: str | None = None
+
+    @callback
+    def async_restore_data(self, payload: dict[str, Any]) -> None:
+        """Restore the last known payload without hitting the API."""
+        snapshot = TrackingSnapshot.from_payload(payload)
+        self._payload = payload
+        self._differ = EventDiffer(snapshot.events)
+        hub = async_get_hub(self.hass)
+        hub.aggregates.async_update(self.tracking_number, snapshot)
+        hub.stall_detector.async_update(
+            self.tracking_number, get_package_name(self.config_entry), snapshot
+        )
+        # Packages tracked before the analytics store existed
+        if not hub.analytics.async_knows(self.tracking_number):
+            hub.analytics.async_record(self.tracking_number, snapshot.events)
+        self.async_set_updated_data(snapshot)
+
+    async def async_set_fetch_result(
+        self,
+        result: dict[str, Any] | AnjunExpressApiClientError,
+    ) -> None:
+        """Apply a payload or error fetched by the hub."""
+        if isinstance(result, AnjunExpressApiClientError):
+            self.metrics.failed_polls += 1
+            self.async_set_update_error(self._update_failed(result))
+            return
+
+        previous = self.data
+        snapshot = await self._async_process_payload(result)
+        if snapshot is previous and self.last_update_success:
+            # The poll metrics still moved, entities skip unchanged states
+            self.async_update_listeners()
+            return
+        self.async_set_updated_data(snapshot)
+
+    async def _async_update_data(self) -> TrackingSnapshot:
         """Update data via library."""
         try:
-            new_data = await (
-                self.config_entry.runtime_data.client.async_get_tracking_data()
+            payload = await (
+                self.config_entry.runtime_data.client.async_get_tracking_data(
+                    self.tracking_number
+                )
             )
         except AnjunExpressApiClientError as exception:
-            raise UpdateFailed(exception) from exception
+            self.metrics.failed_polls += 1
+            raise self._update_failed(exception) from exception
         else:
-            # Check for updates and create notifications
-            await self._check_for_updates(new_data)
+            return await self._async_process_payload(payload)
 
-            # Store current data as previous for next comparison
-            self._previous_data = new_data.copy() if new_data else None
+    def _update_failed(self, exception: AnjunExpressApiClientError) -> UpdateFailed:
+        """Build the update error, including the state of the API circuit."""
+        circuit_state = self.config_entry.runtime_data.client.circuit_state
+        return UpdateFailed(f"{exception} (circuit {circuit_state})")
 
-            return new_data
-
-    async def _check_for_updates(self, new_data: dict[str, Any]) -> None:
-        """Check for updates and create persistent notifications."""
-        if not new_data or not self._previous_data:
-            return
+    async def _async_process_payload(
+        self,
+        payload: dict[str, Any],
+    ) -> TrackingSnapshot:
+        """Turn a payload into a snapshot and report new events."""
+        self._record_poll()
+
+        # The client hands back the same object when nothing changed
+        if payload is self._payload and self.data is not None:
+            self.metrics.unchanged_polls += 1
+            self.new_events = []
+            return self.data
+
+        # Parse once, entities only read the snapshot
+        snapshot = TrackingSnapshot.from_payload(payload)
+        self._payload = payload
+
+        # Check for updates and create notifications
+        started = time.perf_counter()
+        await self._check_for_updates(snapshot)
+        self.metrics.last_diff_time = time.perf_counter() - started
+
+        hub = async_get_hub(self.hass)
+        hub.cache.async_set(self.tracking_number, payload)
+        hub.aggregates.async_update(self.tracking_number, snapshot)
+        hub.stall_detector.async_update(
+            self.tracking_number, get_package_name(self.config_entry), snapshot
+        )
 
-        # Get shipping events from both old and new data
-        old_events = self._previous_data.get("shippingCompany", [])
-        new_events = new_data.get("shippingCompany", [])
+        return snapshot
 
-        if not new_events:
+    def _record_poll(self) -> None:
+        """Copy the measurements of the last request into the metrics."""
+        metrics = self.metrics
+        metrics.polls += 1
+        client = self.config_entry.runtime_data.client
+        if (stats := client.get_request_stats(self.tracking_number)) is None:
+            return
+        metrics.last_poll_latency = stats.latency
+        metrics.max_poll_latency = max(metrics.max_poll_latency or 0.0, stats.latency)
+        metrics.last_payload_size = stats.payload_size
+        metrics.last_decode_time = stats.decode_time
+
+    async def _check_for_updates(self, snapshot: TrackingSnapshot) -> None:
+        """Check for updates and queue their notification."""
+        # The first payload only seeds the events already known
+        hub = async_get_hub(self.hass)
+        if self._differ is None:
+            self._differ = EventDiffer(snapshot.events)
+            self.new_events = []
+            hub.analytics.async_record(self.tracking_number, snapshot.events)
             return
 
-        # Check if there are new events (more events than before)
-        if len(new_events) > len(old_events):
-            latest_event = new_events[0]  # First event is the latest
+        self.new_events = self._differ.diff(snapshot.events)
+        if not self.new_events:
+            return
 
-            package_name = self.config_entry.data[CONF_PACKAGE_NAME]
-            tracking_number = self.config_entry.data[CONF_TRACKING_NUMBER]
+        hub.analytics.async_record(self.tracking_number, self.new_events)
 
-            # Create persistent notification
-            await self._create_update_notification(
-                package_name=package_name,
-                tracking_number=tracking_number,
-                status=latest_event.get("status", "Unknown status"),
-                location=latest_event.get("address", "Unknown location"),
-                date=latest_event.get("date", ""),
-            )
+        self._fire_tracking_events()
 
-    async def _create_update_notification(
-        self,
-        package_name: str,
-        tracking_number: str,
-        status: str,
-        location: str,
-        date: str,
-    ) -> None:
-        """Create a persistent notification for package updates."""
-        # Create notification ID following similar pattern
-        clean_package_name = package_name.lower().replace(" ", "_")
-        clean_tracking = tracking_number.lower()
-        notification_id = f"anjun_{clean_package_name}_{clean_tracking}_update"
-
-        title = f"📦 Package Update: {package_name}"
-
-        message = f"""**Status:** {status}
-**Location:** {location}
-**Tracking:** {tracking_number}
-**Updated:** {date}
-
-Your package has a new tracking update!"""
-
-        async_create(
-            hass=self.hass,
-            message=message,
-            title=title,
-            notification_id=notification_id,
+        # Batched with the updates of other packages
+        hub.notifier.async_add(
+            package_name=get_package_name(self.config_entry),
+            tracking_number=self.tracking_number,
+            events=self.new_events,
         )
+
+    @callback
+    def _fire_tracking_events(self) -> None:
+        """Fire a bus event for every new tracking event, oldest first."""
+        if self._device_id is None:
+            # The device only exists once the entities were added
+            device = dr.async_get(self.hass).async_get_device(
+                identifiers={(DOMAIN, self.config_entry.entry_id)}
+            )
+            self._device_id = device.id if device else None
+
+        for event in reversed(self.new_events):
+            self.hass.bus.async_fire(
+                EVENT_TRACKING,
+                {
+                    ATTR_DEVICE_ID: self._device_id,
+                    "tracking_number": self.tracking_number,
+                    "stage": event.stage,
+                    "status": event.status,
+                    "location": event.location,
+                    "timestamp": (
+                        event.timestamp.isoformat() if event.timestamp else None
+                    ),
+                },
+            )
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+from .const import (
+    CONF_NOTIFICATION_WINDOW,
+    CONF_PACKAGE_NAME,
+    DEFAULT_NOTIFICATION_WINDOW,
+)
+
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.loader import Integration
@@ -23,3 +29,28 @@ class AnjunExpressData:
     client: AnjunExpressApiClient
     coordinator: AnjunExpressDataUpdateCoordinator
     integration: Integration
+
+
+@dataclass(slots=True)
+class AnjunExpressMetrics:
+    """Timings of a package, exposed through diagnostics."""
+
+    setup: dict[str, float] = field(default_factory=dict)
+    polls: int = 0
+    unchanged_polls: int = 0
+    failed_polls: int = 0
+    last_poll_latency: float | None = None
+    max_poll_latency: float | None = None
+    last_payload_size: int | None = None
+    last_decode_time: float | None = None
+    last_diff_time: float | None = None
+
+
+def get_package_name(entry: AnjunExpressConfigEntry) -> str:
+    """Return the package name, as changed in the options if it was."""
+    return entry.options.get(CONF_PACKAGE_NAME) or entry.data[CONF_PACKAGE_NAME]
+
+
+def get_notification_window(entry: AnjunExpressConfigEntry) -> float:
+    """Return the notification window the entry asks for, in seconds."""
+    return entry.options.get(CONF_NOTIFICATION_WINDOW, DEFAULT_NOTIFICATION_WINDOW)
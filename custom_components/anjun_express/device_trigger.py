@@ -0,0 +1,70 @@
+"""Device triggers for Anjun Express."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.homeassistant.triggers import event as event_trigger
+from homeassistant.const import (
+    CONF_DEVICE_ID,
+    CONF_DOMAIN,
+    CONF_PLATFORM,
+    CONF_TYPE,
+)
+
+from .classifier import TrackingStage
+from .const import DOMAIN, EVENT_TRACKING
+
+if TYPE_CHECKING:
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+    from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+    from homeassistant.helpers.typing import ConfigType
+
+# Any new event, or a new event of one stage
+TRIGGER_TRACKING_EVENT = "tracking_event"
+TRIGGER_TYPES = [TRIGGER_TRACKING_EVENT, *(stage.value for stage in TrackingStage)]
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES)}
+)
+
+
+async def async_get_triggers(
+    hass: HomeAssistant,  # noqa: ARG001
+    device_id: str,
+) -> list[dict[str, Any]]:
+    """List the triggers of a package device."""
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in TRIGGER_TYPES
+    ]
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Listen for the tracking events of a package device."""
+    event_data = {CONF_DEVICE_ID: config[CONF_DEVICE_ID]}
+    if config[CONF_TYPE] != TRIGGER_TRACKING_EVENT:
+        event_data["stage"] = config[CONF_TYPE]
+
+    event_config = event_trigger.TRIGGER_SCHEMA(
+        {
+            event_trigger.CONF_PLATFORM: "event",
+            event_trigger.CONF_EVENT_TYPE: EVENT_TRACKING,
+            event_trigger.CONF_EVENT_DATA: event_data,
+        }
+    )
+    return await event_trigger.async_attach_trigger(
+        hass, event_config, action, trigger_info, platform_type="device"
+    )
@@ -0,0 +1,55 @@
+"""Diagnostics support for Anjun Express."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.setup import async_get_domain_setup_times
+
+from .const import DOMAIN
+from .hub import async_get_hub
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import AnjunExpressConfigEntry
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: AnjunExpressConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    client = entry.runtime_data.client
+    snapshot = coordinator.data
+    request_stats = client.get_request_stats(coordinator.tracking_number)
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_exception": repr(coordinator.last_exception),
+            "circuit_state": client.circuit_state,
+            "metrics": asdict(coordinator.metrics),
+            "last_request": asdict(request_stats) if request_stats else None,
+        },
+        "retired": await async_get_hub(hass).archive.async_get(entry.entry_id),
+        "snapshot": {
+            "events": len(snapshot.events),
+            "stage": snapshot.stage,
+            "delivered": snapshot.delivered,
+        }
+        if snapshot
+        else None,
+        # Import, setup and platform times Home Assistant measured for us
+        "integration_setup_times": {
+            str(group): {str(phase): duration for phase, duration in times.items()}
+            for group, times in async_get_domain_setup_times(hass, DOMAIN).items()
+        },
+    }
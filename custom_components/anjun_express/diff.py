@@ -0,0 +1,34 @@
+"""Incremental tracking event diff for Anjun Express."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .model import TrackingEvent
+
+
+class EventDiffer:
+    """Remember which tracking events of a package were already seen."""
+
+    __slots__ = ("_seen",)
+
+    def __init__(self, events: Iterable[TrackingEvent]) -> None:
+        """Initialize the differ with the events already known."""
+        self._seen: set[int] = {event.fingerprint for event in events}
+
+    def diff(self, events: Iterable[TrackingEvent]) -> list[TrackingEvent]:
+        """
+        Return the events not seen before, latest first.
+
+        An edited event gets a new fingerprint and is reported again, while
+        events that only moved within the list are not.
+        """
+        new_events = []
+        for event in events:
+            if event.fingerprint not in self._seen:
+                self._seen.add(event.fingerprint)
+                new_events.append(event)
+        return new_events
@@ -2,32 +2,37 @@
 
 from __future__ import annotations
 
+from typing import Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     ATTRIBUTION,
-    CONF_PACKAGE_NAME,
     CONF_TRACKING_NUMBER,
+    create_device_name,
 )
 from .coordinator import AnjunExpressDataUpdateCoordinator
+from .data import get_package_name
 
 
 class AnjunExpressEntity(CoordinatorEntity[AnjunExpressDataUpdateCoordinator]):
     """AnjunExpressEntity class."""
 
     _attr_attribution = ATTRIBUTION
+    _last_fingerprint: tuple[bool, Any] | None = None
 
     def __init__(self, coordinator: AnjunExpressDataUpdateCoordinator) -> None:
         """Initialize."""
         super().__init__(coordinator)
 
         # Get package info for naming
-        package_name = coordinator.config_entry.data[CONF_PACKAGE_NAME]
+        package_name = get_package_name(coordinator.config_entry)
         tracking_number = coordinator.config_entry.data[CONF_TRACKING_NUMBER]
 
         # Create device name following pattern
-        device_name = f"Anjun {package_name} ({tracking_number})"
+        device_name = create_device_name(package_name, tracking_number)
 
         self._attr_device_info = DeviceInfo(
             identifiers={
@@ -40,3 +45,21 @@ class AnjunExpressEntity(CoordinatorEntity[AnjunExpressDataUpdateCoordinator]):
             manufacturer="Anjun Express",
             model=f"Package Tracking - {tracking_number}",
         )
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._last_fingerprint = (self.available, self._state_fingerprint())
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the entity actually changed."""
+        fingerprint = (self.available, self._state_fingerprint())
+        if fingerprint == self._last_fingerprint:
+            return
+        self._last_fingerprint = fingerprint
+        super()._handle_coordinator_update()
+
+    def _state_fingerprint(self) -> Any:
+        """Return what the written state of the entity is derived from."""
+        return self.coordinator.data
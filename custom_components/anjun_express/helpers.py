@@ -0,0 +1,87 @@
+"""Shared building blocks for the Anjun Express fleet-wide state."""
+
+from __future__ import annotations
+
+import heapq
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+
+class ListenerRegistry:
+    """Callbacks of the entities following some shared state."""
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for changes, return the callback that stops listening."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return _remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Tell every listener something changed."""
+        for listener in list(self._listeners):
+            listener()
+
+
+class LazyMinHeap:
+    """
+    A time per key with the earliest one at hand.
+
+    Changed and removed keys leave stale heap entries behind, skipped once
+    they reach the top. The heap is rebuilt when they outnumber the live
+    keys, so every operation stays O(log n).
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty heap."""
+        self._values: dict[str, datetime] = {}
+        self._heap: list[tuple[datetime, str]] = []
+
+    def get(self, key: str) -> datetime | None:
+        """Return the time of a key."""
+        return self._values.get(key)
+
+    def set(self, key: str, value: datetime) -> None:
+        """Set the time of a key."""
+        if self._values.get(key) == value:
+            return
+        self._values[key] = value
+        if len(self._heap) > 2 * len(self._values) + 16:
+            # The live values already hold the new one
+            self._heap = [(value, key) for key, value in self._values.items()]
+            heapq.heapify(self._heap)
+            return
+        heapq.heappush(self._heap, (value, key))
+
+    def remove(self, key: str) -> None:
+        """Forget a key, its heap entry goes stale."""
+        self._values.pop(key, None)
+
+    def peek(self) -> tuple[datetime, str] | None:
+        """Return the earliest time and its key."""
+        heap = self._heap
+        while heap and self._values.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def pop_due(self, now: datetime) -> list[str]:
+        """Remove and return the keys whose time has come."""
+        due = []
+        while (earliest := self.peek()) is not None and earliest[0] <= now:
+            heapq.heappop(self._heap)
+            del self._values[earliest[1]]
+            due.append(earliest[1])
+        return due
@@ -0,0 +1,204 @@
+"""Shared polling hub for Anjun Express."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .aggregates import AnjunExpressAggregates
+from .analytics import AnjunExpressAnalytics
+from .api import AnjunExpressApiClient
+from .archive import AnjunExpressArchive
+from .cache import AnjunExpressTrackingCache
+from .const import (
+    CONF_REMOVE_RETIRED,
+    CONF_RETIRE_AFTER,
+    DEFAULT_RETIRE_AFTER,
+    DOMAIN,
+    HUB_TICK_INTERVAL,
+    LOGGER,
+)
+from .data import get_package_name
+from .notifications import AnjunExpressNotifier
+from .scheduler import compute_restore_delay, compute_update_interval
+from .stall import AnjunExpressStallDetector
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .coordinator import AnjunExpressDataUpdateCoordinator
+
+DATA_HUB: HassKey[AnjunExpressHub] = HassKey(DOMAIN)
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> AnjunExpressHub:
+    """Return the shared hub, creating it on first use."""
+    if (hub := hass.data.get(DATA_HUB)) is None:
+        hub = hass.data[DATA_HUB] = AnjunExpressHub(hass)
+    return hub
+
+
+class AnjunExpressHub:
+    """Drive every package coordinator from a single scheduled job."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.client = AnjunExpressApiClient(session=async_get_clientsession(hass))
+        self.cache = AnjunExpressTrackingCache(hass)
+        self.notifier = AnjunExpressNotifier(hass)
+        self.analytics = AnjunExpressAnalytics(hass)
+        self.archive = AnjunExpressArchive(hass)
+        self.stall_detector = AnjunExpressStallDetector(hass)
+        self.aggregates = AnjunExpressAggregates(hass, self.stall_detector)
+        self._coordinators: dict[str, AnjunExpressDataUpdateCoordinator] = {}
+        self._next_refresh: dict[str, datetime] = {}
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+        self._refreshing = False
+
+    @callback
+    def async_register(
+        self,
+        coordinator: AnjunExpressDataUpdateCoordinator,
+        *,
+        refresh_soon: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Register a coordinator to be polled by the hub."""
+        entry_id = coordinator.config_entry.entry_id
+        self._coordinators[entry_id] = coordinator
+        if refresh_soon:
+            self._next_refresh[entry_id] = dt_util.utcnow() + compute_restore_delay()
+        else:
+            self._schedule_next_refresh(coordinator)
+
+        if self._unsub_refresh is None:
+            self._unsub_refresh = async_track_time_interval(
+                self.hass,
+                self._async_refresh_due,
+                timedelta(minutes=HUB_TICK_INTERVAL),
+                name=f"{DOMAIN} hub refresh",
+                cancel_on_shutdown=True,
+            )
+
+        @callback
+        def _unregister() -> None:
+            self._async_unregister(entry_id)
+
+        return _unregister
+
+    @callback
+    def _async_unregister(self, entry_id: str) -> None:
+        """Stop polling a package."""
+        self._coordinators.pop(entry_id, None)
+        self._next_refresh.pop(entry_id, None)
+        if not self._coordinators and self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+    @callback
+    def async_reschedule(self, coordinator: AnjunExpressDataUpdateCoordinator) -> None:
+        """Pick the next poll time again, for example after an option changed."""
+        if coordinator.config_entry.entry_id in self._coordinators:
+            self._schedule_next_refresh(coordinator)
+
+    @callback
+    def _schedule_next_refresh(
+        self,
+        coordinator: AnjunExpressDataUpdateCoordinator,
+    ) -> None:
+        """Pick the next poll time of a package from its latest data."""
+        now = dt_util.utcnow()
+        next_refresh = now + compute_update_interval(coordinator.data, now)
+        # Wake up in time to retire a delivered package
+        if (retire_at := get_retire_at(coordinator)) is not None:
+            next_refresh = min(next_refresh, retire_at)
+        self._next_refresh[coordinator.config_entry.entry_id] = next_refresh
+
+    async def _async_retire(
+        self,
+        coordinator: AnjunExpressDataUpdateCoordinator,
+    ) -> None:
+        """Stop polling a delivered package, archive it and maybe remove it."""
+        entry = coordinator.config_entry
+        self._async_unregister(entry.entry_id)
+        self.client.forget(coordinator.tracking_number)
+        await self.archive.async_load()
+        self.archive.async_add(
+            entry.entry_id,
+            coordinator.tracking_number,
+            get_package_name(entry),
+            coordinator.data,
+            dt_util.utcnow(),
+        )
+        LOGGER.info("Retiring delivered package %s", coordinator.tracking_number)
+        if entry.options.get(CONF_REMOVE_RETIRED, False):
+            await self.hass.config_entries.async_remove(entry.entry_id)
+
+    async def _async_refresh_due(self, now: datetime) -> None:
+        """Fetch every package that is due in one bulk request batch."""
+        if self._refreshing:
+            LOGGER.debug("Previous hub refresh still running, skipping")
+            return
+
+        due = {
+            coordinator.tracking_number: coordinator
+            for entry_id, coordinator in self._coordinators.items()
+            if self._next_refresh.get(entry_id, now) <= now
+        }
+        if not due:
+            return
+
+        self._refreshing = True
+        try:
+            for tracking_number, coordinator in list(due.items()):
+                retire_at = get_retire_at(coordinator)
+                if retire_at is not None and retire_at <= now:
+                    del due[tracking_number]
+                    try:
+                        await self._async_retire(coordinator)
+                    except Exception:  # noqa: BLE001
+                        LOGGER.exception("Error retiring package %s", tracking_number)
+
+            results = self.client.async_get_tracking_data_bulk(list(due))
+            async for tracking_number, result in results:
+                coordinator = due.pop(tracking_number)
+                if not self._is_registered(coordinator):
+                    continue
+                # One broken package must not hold back the others
+                try:
+                    await coordinator.async_set_fetch_result(result)
+                except Exception:  # noqa: BLE001
+                    LOGGER.exception("Error updating package %s", tracking_number)
+                self._schedule_next_refresh(coordinator)
+        finally:
+            self._refreshing = False
+            # Packages a failed batch never reached wait for their next poll
+            for coordinator in due.values():
+                if self._is_registered(coordinator):
+                    self._schedule_next_refresh(coordinator)
+
+    def _is_registered(self, coordinator: AnjunExpressDataUpdateCoordinator) -> bool:
+        """Return whether a coordinator is still polled by the hub."""
+        entry_id = coordinator.config_entry.entry_id
+        return self._coordinators.get(entry_id) is coordinator
+
+
+def get_retire_at(coordinator: AnjunExpressDataUpdateCoordinator) -> datetime | None:
+    """Return when a delivered package should be retired, if ever."""
+    snapshot = coordinator.data
+    if snapshot is None or snapshot.delivered_at is None:
+        return None
+    if not (
+        days := coordinator.config_entry.options.get(
+            CONF_RETIRE_AFTER, DEFAULT_RETIRE_AFTER
+        )
+    ):
+        return None
+    return snapshot.delivered_at + timedelta(days=days)
@@ -0,0 +1,127 @@
+"""Parsed tracking model for Anjun Express."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from .classifier import TrackingStage, classify_status
+from .const import HISTORY_ATTRIBUTE_LIMIT
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+
+def parse_event_date(date_str: str | None) -> datetime | None:
+    """Parse an event date, assuming UTC when no offset is given."""
+    if not date_str:
+        return None
+    try:
+        timestamp = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    return timestamp
+
+
+@dataclass(frozen=True, slots=True)
+class TrackingEvent:
+    """A single tracking event."""
+
+    date: str | None
+    status: str | None
+    location: str | None
+    remark: str | None
+    timestamp: datetime | None
+    stage: TrackingStage
+    fingerprint: int
+
+    @classmethod
+    def from_dict(cls, event: dict[str, Any]) -> TrackingEvent:
+        """Parse an event of the shippingCompany list."""
+        date = event.get("date")
+        status = event.get("status")
+        location = event.get("address")
+        return cls(
+            date=date,
+            status=status,
+            location=location,
+            remark=event.get("remark"),
+            timestamp=parse_event_date(date),
+            stage=classify_status(status) if status else TrackingStage.IN_TRANSIT,
+            fingerprint=hash((date, status, location)),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the event as exposed in state attributes."""
+        return {
+            "date": self.date,
+            "status": self.status,
+            "location": self.location,
+            "remark": self.remark,
+            "stage": self.stage,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class TrackingSnapshot:
+    """Everything the entities need from one tracking payload."""
+
+    events: tuple[TrackingEvent, ...]
+    latest: TrackingEvent | None
+    stage: TrackingStage | None
+    delivered: bool
+    delivered_at: datetime | None
+    collection_info: dict[str, Any] | None
+    events_attribute: tuple[dict[str, Any], ...]
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any] | None) -> TrackingSnapshot:
+        """Parse a get-tracking payload once."""
+        payload = payload or {}
+        events = tuple(
+            TrackingEvent.from_dict(event)
+            for event in payload.get("shippingCompany") or []
+        )
+        collect_order = payload.get("clCollectOrder") or {}
+        latest = events[0] if events else None  # First event is the latest
+        delivered_event = next(
+            (event for event in events if event.stage is TrackingStage.DELIVERED),
+            None,
+        )
+        return cls(
+            events=events,
+            latest=latest,
+            stage=latest.stage if latest else None,
+            delivered=delivered_event is not None,
+            delivered_at=delivered_event.timestamp if delivered_event else None,
+            collection_info=collect_order if any(collect_order.values()) else None,
+            events_attribute=tuple(
+                event.as_dict() for event in events[:HISTORY_ATTRIBUTE_LIMIT]
+            ),
+        )
+
+    def history(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        stages: Collection[TrackingStage] | None = None,
+        since: datetime | None = None,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """Return the number of matching events and one page of them."""
+        matching = [
+            event
+            for event in self.events
+            if (not stages or event.stage in stages)
+            and (
+                since is None
+                or (event.timestamp is not None and event.timestamp >= since)
+            )
+        ]
+        stop = None if limit is None else offset + limit
+        return len(matching), [
+            event.as_dict() for event in islice(matching, offset, stop)
+        ]
@@ -0,0 +1,145 @@
+"""Batched package update notifications for Anjun Express."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import count
+from typing import TYPE_CHECKING
+
+from homeassistant.components.persistent_notification import async_create
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DEFAULT_NOTIFICATION_WINDOW, DOMAIN, EVENT_DIGEST
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .model import TrackingEvent
+
+
+@dataclass(slots=True)
+class PackageUpdate:
+    """New events of one package waiting to be notified."""
+
+    package_name: str
+    tracking_number: str
+    events: list[TrackingEvent]
+
+
+class AnjunExpressNotifier:
+    """
+    Collect package updates over a window and notify them at once.
+
+    The window is shared by every package, the shortest one configured on
+    any entry is used so no package waits longer than it asked for.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the notifier."""
+        self.hass = hass
+        self._pending: dict[str, PackageUpdate] = {}
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._windows: dict[str, float] = {}
+        self._digest_ids = count(1)
+
+    @property
+    def window(self) -> float:
+        """Return the seconds updates are collected for."""
+        return min(self._windows.values(), default=DEFAULT_NOTIFICATION_WINDOW)
+
+    @callback
+    def async_set_window(self, entry_id: str, window: float) -> None:
+        """Set the window an entry asked for."""
+        self._windows[entry_id] = window
+
+    @callback
+    def async_remove_window(self, entry_id: str) -> None:
+        """Forget the window of an unloaded entry."""
+        self._windows.pop(entry_id, None)
+
+    @callback
+    def async_add(
+        self,
+        package_name: str,
+        tracking_number: str,
+        events: list[TrackingEvent],
+    ) -> None:
+        """Queue new events, the first update of a batch opens its window."""
+        if (update := self._pending.get(tracking_number)) is None:
+            self._pending[tracking_number] = PackageUpdate(
+                package_name, tracking_number, list(events)
+            )
+        else:
+            update.package_name = package_name
+            # Keep the latest events first
+            update.events[:0] = events
+
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, self.window, self._async_flush
+            )
+
+    @callback
+    def _async_flush(self, _now: datetime) -> None:
+        """Send one notification and one bus event for the whole batch."""
+        self._unsub_flush = None
+        updates, self._pending = list(self._pending.values()), {}
+        if not updates:
+            return
+
+        self.hass.bus.async_fire(
+            EVENT_DIGEST,
+            {
+                "packages": [
+                    {
+                        "package_name": update.package_name,
+                        "tracking_number": update.tracking_number,
+                        "events": [event.as_dict() for event in update.events],
+                    }
+                    for update in updates
+                ]
+            },
+        )
+
+        if len(updates) == 1:
+            async_create(
+                hass=self.hass,
+                message=_package_message(updates[0]),
+                title=f"📦 Package Update: {updates[0].package_name}",
+                notification_id=_package_notification_id(updates[0]),
+            )
+            return
+
+        lines = [
+            f"- **{update.package_name}** ({update.tracking_number}): "
+            f"{update.events[0].status or 'Unknown status'} - "
+            f"{update.events[0].location or 'Unknown location'}"
+            for update in updates
+        ]
+        async_create(
+            hass=self.hass,
+            message="\n".join(lines),
+            title=f"📦 {len(updates)} Package Updates",
+            # Every digest stays until read, a later one does not replace it
+            notification_id=f"{DOMAIN}_digest_{next(self._digest_ids)}",
+        )
+
+
+def _package_notification_id(update: PackageUpdate) -> str:
+    """Return the notification ID of a single package."""
+    # Create notification ID following similar pattern
+    clean_package_name = update.package_name.lower().replace(" ", "_")
+    clean_tracking = update.tracking_number.lower()
+    return f"anjun_{clean_package_name}_{clean_tracking}_update"
+
+
+def _package_message(update: PackageUpdate) -> str:
+    """Return the notification message of a single package."""
+    latest_event = update.events[0]  # First event is the latest
+    return f"""**Status:** {latest_event.status or "Unknown status"}
+**Location:** {latest_event.location or "Unknown location"}
+**Tracking:** {update.tracking_number}
+**Updated:** {latest_event.date or ""}
+
+Your package has a new tracking update!"""
@@ -0,0 +1,66 @@
+"""Adaptive polling schedule for Anjun Express."""
+
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from .classifier import TrackingStage
+from .const import (
+    DEFAULT_UPDATE_INTERVAL,
+    DELIVERED_UPDATE_INTERVAL,
+    MAX_UPDATE_INTERVAL,
+    OUT_FOR_DELIVERY_UPDATE_INTERVAL,
+    RESTORE_REFRESH_WINDOW,
+    UPDATE_INTERVAL_JITTER,
+)
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .model import TrackingSnapshot
+
+
+def compute_update_interval(
+    snapshot: TrackingSnapshot | None,
+    now: datetime,
+) -> timedelta:
+    """
+    Return how long to wait before polling a package again.
+
+    Delivered and returned packages are barely polled, packages out for delivery are
+    polled often and in-transit packages back off as their last event ages.
+    """
+    latest_event = snapshot.latest if snapshot else None
+    if latest_event is None:
+        return _with_jitter(DEFAULT_UPDATE_INTERVAL)
+
+    if latest_event.stage in (TrackingStage.DELIVERED, TrackingStage.RETURNED):
+        return _with_jitter(DELIVERED_UPDATE_INTERVAL)
+
+    if latest_event.stage is TrackingStage.OUT_FOR_DELIVERY:
+        return _with_jitter(OUT_FOR_DELIVERY_UPDATE_INTERVAL)
+
+    # Double the interval for every full day without movement
+    stale_days = 0
+    if latest_event.timestamp is not None:
+        stale_days = max((now - latest_event.timestamp).days, 0)
+
+    minutes = min(
+        DEFAULT_UPDATE_INTERVAL * 2 ** min(stale_days, 8),
+        MAX_UPDATE_INTERVAL,
+    )
+    return _with_jitter(minutes)
+
+
+def compute_restore_delay() -> timedelta:
+    """Return how long to wait before refreshing a package restored from the cache."""
+    # Spread over a short window so a restart does not poll every package at once
+    return timedelta(minutes=random.uniform(0, RESTORE_REFRESH_WINDOW))  # noqa: S311
+
+
+def _with_jitter(minutes: float) -> timedelta:
+    """Spread polls so packages with the same interval do not align."""
+    spread = minutes * UPDATE_INTERVAL_JITTER
+    return timedelta(minutes=minutes + random.uniform(-spread, spread))  # noqa: S311
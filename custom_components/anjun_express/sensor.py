@@ -2,74 +2,281 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import callback
 
-from .const import CONF_PACKAGE_NAME, CONF_TRACKING_NUMBER, create_entity_id
+from .classifier import TrackingStage
+from .const import (
+    ATTRIBUTION,
+    CONF_PACKAGE_NAME,
+    CONF_TRACKING_NUMBER,
+    DOMAIN,
+    create_entity_id,
+)
 from .entity import AnjunExpressEntity
+from .hub import async_get_hub
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
+    from .aggregates import AnjunExpressAggregates
+    from .analytics import AnjunExpressAnalytics, DeliveryEstimate
     from .coordinator import AnjunExpressDataUpdateCoordinator
-    from .data import AnjunExpressConfigEntry
+    from .data import AnjunExpressConfigEntry, AnjunExpressMetrics
+    from .model import TrackingEvent, TrackingSnapshot
+
+
+@dataclass(frozen=True, kw_only=True)
+class AnjunExpressSensorEntityDescription(SensorEntityDescription):
+    """Describes an Anjun Express sensor."""
+
+    value_fn: Callable[
+        [TrackingEvent, TrackingSnapshot], str | int | datetime | None
+    ] = lambda *_: None
+    # Diagnostic sensors read the poll metrics instead of the snapshot
+    metric_fn: Callable[[AnjunExpressMetrics], float | None] | None = None
+
 
 ENTITY_DESCRIPTIONS = (
-    SensorEntityDescription(
+    AnjunExpressSensorEntityDescription(
         key="current_status",
         name="Current Status",
         icon="mdi:package-variant",
+        value_fn=lambda latest, _: latest.status,
     ),
-    SensorEntityDescription(
+    AnjunExpressSensorEntityDescription(
+        key="stage",
+        name="Stage",
+        icon="mdi:truck-delivery",
+        device_class=SensorDeviceClass.ENUM,
+        options=[stage.value for stage in TrackingStage],
+        value_fn=lambda latest, _: latest.stage,
+    ),
+    AnjunExpressSensorEntityDescription(
         key="current_location",
         name="Current Location",
         icon="mdi:map-marker",
+        value_fn=lambda latest, _: latest.location,
     ),
-    SensorEntityDescription(
+    AnjunExpressSensorEntityDescription(
         key="last_update",
         name="Last Update",
         icon="mdi:clock",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda latest, _: latest.timestamp,
     ),
-    SensorEntityDescription(
+    AnjunExpressSensorEntityDescription(
         key="tracking_events",
         name="Tracking Events",
         icon="mdi:format-list-bulleted",
         entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda _, snapshot: len(snapshot.events),
+    ),
+    AnjunExpressSensorEntityDescription(
+        key="poll_latency",
+        name="Poll Latency",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        metric_fn=lambda metrics: (
+            metrics.last_poll_latency * 1000
+            if metrics.last_poll_latency is not None
+            else None
+        ),
+    ),
+    AnjunExpressSensorEntityDescription(
+        key="payload_size",
+        name="Payload Size",
+        icon="mdi:file-outline",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        metric_fn=lambda metrics: metrics.last_payload_size,
+    ),
+)
+
+
+ETA_ENTITY_DESCRIPTION = AnjunExpressSensorEntityDescription(
+    key="estimated_delivery",
+    name="Estimated Delivery",
+    icon="mdi:calendar-clock",
+    device_class=SensorDeviceClass.TIMESTAMP,
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class AnjunExpressAnalyticsSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor with the statistics of one stage transition."""
+
+    from_stage: TrackingStage
+    to_stage: TrackingStage
+    device_class: SensorDeviceClass = SensorDeviceClass.DURATION
+    state_class: SensorStateClass = SensorStateClass.MEASUREMENT
+    native_unit_of_measurement: str = UnitOfTime.SECONDS
+    suggested_unit_of_measurement: str = UnitOfTime.HOURS
+    suggested_display_precision: int = 1
+
+
+ANALYTICS_ENTITY_DESCRIPTIONS = (
+    AnjunExpressAnalyticsSensorEntityDescription(
+        key="median_transit_time",
+        name="Median Transit Time",
+        icon="mdi:truck-fast",
+        from_stage=TrackingStage.POSTED,
+        to_stage=TrackingStage.DELIVERED,
+    ),
+    AnjunExpressAnalyticsSensorEntityDescription(
+        key="median_customs_clearance",
+        name="Median Customs Clearance",
+        icon="mdi:file-document-check",
+        from_stage=TrackingStage.CUSTOMS,
+        to_stage=TrackingStage.OUT_FOR_DELIVERY,
+    ),
+    AnjunExpressAnalyticsSensorEntityDescription(
+        key="median_customs_to_delivery",
+        name="Median Customs to Delivery",
+        icon="mdi:home-import-outline",
+        from_stage=TrackingStage.CUSTOMS,
+        to_stage=TrackingStage.DELIVERED,
     ),
 )
 
 
+@dataclass(frozen=True, kw_only=True)
+class AnjunExpressAggregateSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor aggregated over every package."""
+
+    value_fn: Callable[[AnjunExpressAggregates], int | datetime | None]
+    attributes_fn: Callable[[AnjunExpressAggregates], dict[str, Any] | None] = (
+        lambda _: None
+    )
+
+
+STAGE_COUNT_NAMES = {
+    TrackingStage.POSTED: "Packages Posted",
+    TrackingStage.IN_TRANSIT: "Packages In Transit",
+    TrackingStage.CUSTOMS: "Packages In Customs",
+    TrackingStage.OUT_FOR_DELIVERY: "Packages Out for Delivery",
+    TrackingStage.DELIVERED: "Packages Delivered",
+    TrackingStage.RETURNED: "Packages Returned",
+    TrackingStage.EXCEPTION: "Packages With Problems",
+}
+
+AGGREGATE_ENTITY_DESCRIPTIONS = (
+    *(
+        AnjunExpressAggregateSensorEntityDescription(
+            key=f"packages_{stage}",
+            name=name,
+            icon="mdi:package-variant-closed",
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=lambda aggregates, stage=stage: aggregates.async_count(stage),
+        )
+        for stage, name in STAGE_COUNT_NAMES.items()
+    ),
+    AnjunExpressAggregateSensorEntityDescription(
+        key="oldest_in_transit",
+        name="Oldest Package In Transit",
+        icon="mdi:package-variant-closed-remove",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda aggregates: (
+            oldest[0] if (oldest := aggregates.async_oldest()) else None
+        ),
+        attributes_fn=lambda aggregates: (
+            {"tracking_number": oldest[1]}
+            if (oldest := aggregates.async_oldest())
+            else None
+        ),
+    ),
+    AnjunExpressAggregateSensorEntityDescription(
+        key="stalled_packages",
+        name="Stalled Packages",
+        icon="mdi:package-variant-closed-minus",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregates: len(aggregates.async_stalled()),
+        attributes_fn=lambda aggregates: {
+            "tracking_numbers": sorted(aggregates.async_stalled())
+        },
+    ),
+)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,  # noqa: ARG001
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the sensors shared by every package."""
+    if discovery_info is None:
+        return
+    hub = async_get_hub(hass)
+    async_add_entities(
+        [
+            *(
+                AnjunExpressAnalyticsSensor(hub.analytics, entity_description)
+                for entity_description in ANALYTICS_ENTITY_DESCRIPTIONS
+            ),
+            *(
+                AnjunExpressAggregateSensor(hub.aggregates, entity_description)
+                for entity_description in AGGREGATE_ENTITY_DESCRIPTIONS
+            ),
+        ]
+    )
+
+
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
     entry: AnjunExpressConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
+    coordinator = entry.runtime_data.coordinator
     async_add_entities(
-        AnjunExpressSensor(
-            coordinator=entry.runtime_data.coordinator,
-            entity_description=entity_description,
-        )
-        for entity_description in ENTITY_DESCRIPTIONS
+        [
+            *(
+                AnjunExpressSensor(
+                    coordinator=coordinator,
+                    entity_description=entity_description,
+                )
+                for entity_description in ENTITY_DESCRIPTIONS
+            ),
+            AnjunExpressEtaSensor(
+                coordinator=coordinator,
+                entity_description=ETA_ENTITY_DESCRIPTION,
+            ),
+        ]
     )
 
 
 class AnjunExpressSensor(AnjunExpressEntity, SensorEntity):
     """Anjun Express Sensor class."""
 
+    entity_description: AnjunExpressSensorEntityDescription
+    # The full history is served by the get_history service
+    _unrecorded_attributes = frozenset({"events"})
+
     def __init__(
         self,
         coordinator: AnjunExpressDataUpdateCoordinator,
-        entity_description: SensorEntityDescription,
+        entity_description: AnjunExpressSensorEntityDescription,
     ) -> None:
         """Initialize the sensor class."""
         super().__init__(coordinator)
@@ -85,65 +292,164 @@ class AnjunExpressSensor(AnjunExpressEntity, SensorEntity):
         )
 
         # Set entity name following the pattern
-        entity_name = (
-            f"Anjun {tracking_number} {entity_description.name}"
-        )
+        entity_name = f"Anjun {tracking_number} {entity_description.name}"
         self._attr_name = entity_name
 
+    def _state_fingerprint(self) -> Any:
+        """Return the value and attributes written to the state machine."""
+        return self.native_value, self.extra_state_attributes
+
     @property
-    def native_value(self) -> str | datetime | None:
+    def native_value(self) -> str | int | float | datetime | None:
         """Return the native value of the sensor."""
-        if not self.coordinator.data or "shippingCompany" not in self.coordinator.data:
-            return None
+        if (metric_fn := self.entity_description.metric_fn) is not None:
+            return metric_fn(self.coordinator.metrics)
 
-        shipping_events = self.coordinator.data.get("shippingCompany", [])
-        if not shipping_events:
+        snapshot = self.coordinator.data
+        if snapshot is None or snapshot.latest is None:
             return None
 
-        latest_event = shipping_events[0]  # First event is the latest
-
-        value_map = {
-            "current_status": latest_event.get("status"),
-            "current_location": latest_event.get("address"),
-            "tracking_events": len(shipping_events),
-        }
-
-        if self.entity_description.key in value_map:
-            return value_map[self.entity_description.key]
-
-        if self.entity_description.key == "last_update":
-            date_str = latest_event.get("date")
-            if date_str:
-                try:
-                    return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                except ValueError:
-                    return None
-
-        return None
+        return self.entity_description.value_fn(snapshot.latest, snapshot)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return extra state attributes."""
-        if not self.coordinator.data:
+        snapshot = self.coordinator.data
+        if snapshot is None:
             return None
 
         attributes = {}
 
         if self.entity_description.key == "tracking_events":
-            events = self.coordinator.data.get("shippingCompany", [])
-            attributes["events"] = [
-                {
-                    "date": event.get("date"),
-                    "status": event.get("status"),
-                    "location": event.get("address"),
-                    "remark": event.get("remark"),
-                }
-                for event in events
-            ]
+            attributes["events"] = snapshot.events_attribute
 
         # Add collection order info if available
-        collect_order = self.coordinator.data.get("clCollectOrder", {})
-        if collect_order and any(collect_order.values()):
-            attributes["collection_info"] = collect_order
+        if snapshot.collection_info:
+            attributes["collection_info"] = snapshot.collection_info
 
         return attributes if attributes else None
+
+
+class AnjunExpressEtaSensor(AnjunExpressSensor):
+    """Estimated delivery time of a package, from past deliveries."""
+
+    async def async_added_to_hass(self) -> None:
+        """Also follow the statistics, other deliveries move the estimate."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_get_hub(self.hass).analytics.async_add_listener(
+                self._handle_coordinator_update
+            )
+        )
+
+    def _get_estimate(self) -> DeliveryEstimate | None:
+        """Return the estimate, returned packages are never delivered."""
+        snapshot = self.coordinator.data
+        if snapshot is None or snapshot.stage is TrackingStage.RETURNED:
+            return None
+        return async_get_hub(self.hass).analytics.async_estimate_delivery(
+            self.coordinator.tracking_number
+        )
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the estimated delivery time."""
+        estimate = self._get_estimate()
+        return estimate.time if estimate else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return what the estimate is based on."""
+        if (estimate := self._get_estimate()) is None:
+            return None
+        return {"based_on": estimate.based_on, "samples": estimate.samples}
+
+
+class AnjunExpressAnalyticsSensor(SensorEntity):
+    """Statistics of one stage transition across every package."""
+
+    entity_description: AnjunExpressAnalyticsSensorEntityDescription
+    _attr_attribution = ATTRIBUTION
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        analytics: AnjunExpressAnalytics,
+        entity_description: AnjunExpressAnalyticsSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        self.entity_description = entity_description
+        self._analytics = analytics
+        self._attr_unique_id = f"{DOMAIN}_{entity_description.key}"
+        self._attr_name = f"Anjun {entity_description.name}"
+        self._attr_extra_state_attributes = {}
+        self._update_from_stats()
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the statistics."""
+        self.async_on_remove(self._analytics.async_add_listener(self._handle_update))
+
+    @callback
+    def _handle_update(self) -> None:
+        """Write the state when the transition statistics changed."""
+        if self._update_from_stats():
+            self.async_write_ha_state()
+
+    def _update_from_stats(self) -> bool:
+        """Read the precomputed statistics, return whether they changed."""
+        stats = self._analytics.async_get_stats(
+            self.entity_description.from_stage, self.entity_description.to_stage
+        )
+        attributes = {"samples": stats.count, "p90": stats.p90}
+        if (
+            stats.median == self._attr_native_value
+            and attributes == self._attr_extra_state_attributes
+        ):
+            return False
+        self._attr_native_value = stats.median
+        self._attr_extra_state_attributes = attributes
+        return True
+
+
+class AnjunExpressAggregateSensor(SensorEntity):
+    """A count or extreme over every package."""
+
+    entity_description: AnjunExpressAggregateSensorEntityDescription
+    _attr_attribution = ATTRIBUTION
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        aggregates: AnjunExpressAggregates,
+        entity_description: AnjunExpressAggregateSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        self.entity_description = entity_description
+        self._aggregates = aggregates
+        self._attr_unique_id = f"{DOMAIN}_{entity_description.key}"
+        self._attr_name = f"Anjun {entity_description.name}"
+        self._attr_extra_state_attributes = {}
+        self._update_from_aggregates()
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the aggregates."""
+        self.async_on_remove(self._aggregates.async_add_listener(self._handle_update))
+
+    @callback
+    def _handle_update(self) -> None:
+        """Write the state when this aggregate changed."""
+        if self._update_from_aggregates():
+            self.async_write_ha_state()
+
+    def _update_from_aggregates(self) -> bool:
+        """Read the maintained aggregate, return whether it changed."""
+        value = self.entity_description.value_fn(self._aggregates)
+        attributes = self.entity_description.attributes_fn(self._aggregates)
+        if (
+            value == self._attr_native_value
+            and attributes == self._attr_extra_state_attributes
+        ):
+            return False
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        return True
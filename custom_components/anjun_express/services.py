@@ -0,0 +1,265 @@
+"""Services for Anjun Express."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .api import (
+    AnjunExpressApiClientCommunicationError,
+    AnjunExpressApiClientError,
+    AnjunExpressApiClientTrackingNotFoundError,
+)
+from .classifier import TrackingStage
+from .const import (
+    CONF_PACKAGE_NAME,
+    CONF_TRACKING_NUMBER,
+    DOMAIN,
+    HISTORY_MAX_PAGE_SIZE,
+    HISTORY_PAGE_SIZE,
+    IMPORT_MAX_PACKAGES,
+    LOGGER,
+    MAX_CONCURRENT_REQUESTS,
+)
+from .hub import async_get_hub
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from .data import AnjunExpressConfigEntry
+
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_IMPORT_PACKAGES = "import_packages"
+SERVICE_GET_STATISTICS = "get_statistics"
+
+ATTR_OFFSET = "offset"
+ATTR_LIMIT = "limit"
+ATTR_STAGES = "stages"
+ATTR_SINCE = "since"
+ATTR_PACKAGES = "packages"
+ATTR_CSV = "csv"
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_TRACKING_NUMBER): cv.string,
+        vol.Optional(ATTR_OFFSET, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_LIMIT, default=HISTORY_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=HISTORY_MAX_PAGE_SIZE)
+        ),
+        vol.Optional(ATTR_STAGES): vol.All(cv.ensure_list, [vol.Coerce(TrackingStage)]),
+        vol.Optional(ATTR_SINCE): cv.datetime,
+    }
+)
+
+IMPORT_PACKAGES_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Exclusive(ATTR_PACKAGES, ATTR_PACKAGES): vol.All(
+                cv.ensure_list,
+                [
+                    vol.Schema(
+                        {
+                            vol.Required(CONF_TRACKING_NUMBER): cv.string,
+                            vol.Optional(CONF_PACKAGE_NAME): cv.string,
+                        }
+                    )
+                ],
+                vol.Length(max=IMPORT_MAX_PACKAGES),
+            ),
+            vol.Exclusive(ATTR_CSV, ATTR_PACKAGES): cv.string,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_PACKAGES, ATTR_CSV),
+)
+
+GET_STATISTICS_SCHEMA = vol.Schema({vol.Optional(ATTR_SINCE): cv.datetime})
+
+
+@callback
+def async_get_loaded_entry(
+    hass: HomeAssistant,
+    tracking_number: str,
+) -> AnjunExpressConfigEntry:
+    """Return the loaded config entry of a tracking number."""
+    entry = hass.config_entries.async_entry_for_domain_unique_id(
+        DOMAIN, tracking_number.upper()
+    )
+    if entry is None or entry.state is not ConfigEntryState.LOADED:
+        msg = f"Tracking number {tracking_number} is not loaded"
+        raise ServiceValidationError(msg)
+    return entry
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Anjun Express services."""
+
+    async def _async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return one page of the event history of a package."""
+        tracking_number = call.data[CONF_TRACKING_NUMBER]
+        snapshot = async_get_loaded_entry(
+            hass, tracking_number
+        ).runtime_data.coordinator.data
+        if snapshot is None:
+            return {"tracking_number": tracking_number, "total": 0, "events": []}
+
+        # Naive datetimes are in the configured time zone
+        if (since := call.data.get(ATTR_SINCE)) is not None:
+            since = dt_util.as_utc(since)
+
+        total, events = snapshot.history(
+            offset=call.data[ATTR_OFFSET],
+            limit=call.data[ATTR_LIMIT],
+            stages=call.data.get(ATTR_STAGES),
+            since=since,
+        )
+        return {
+            "tracking_number": tracking_number,
+            "total": total,
+            "events": events,
+        }
+
+    async def _async_import_packages(call: ServiceCall) -> ServiceResponse:
+        """Validate many packages at once and create an entry for each."""
+        if ATTR_CSV in call.data:
+            rows = _parse_csv(call.data[ATTR_CSV])
+        else:
+            rows = (
+                (package[CONF_TRACKING_NUMBER], package.get(CONF_PACKAGE_NAME))
+                for package in call.data[ATTR_PACKAGES]
+            )
+        packages = _collect_packages(rows)
+        if len(packages) > IMPORT_MAX_PACKAGES:
+            msg = f"At most {IMPORT_MAX_PACKAGES} packages can be imported at once"
+            raise ServiceValidationError(msg)
+        return await _async_import(hass, packages)
+
+    async def _async_get_statistics(call: ServiceCall) -> ServiceResponse:
+        """Return the stage transition statistics of every package."""
+        analytics = async_get_hub(hass).analytics
+        await analytics.async_load()
+        # Without a start the precomputed statistics answer directly
+        if (since := call.data.get(ATTR_SINCE)) is None:
+            stats = analytics.async_get_all_stats()
+        else:
+            stats = await analytics.async_query_stats(dt_util.as_utc(since))
+        return {"transitions": [transition.as_dict() for transition in stats]}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_PACKAGES,
+        _async_import_packages,
+        schema=IMPORT_PACKAGES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_STATISTICS,
+        _async_get_statistics,
+        schema=GET_STATISTICS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _parse_csv(text: str) -> Iterator[tuple[str, str | None]]:
+    """Parse tracking_number,package_name rows, a header row is optional."""
+    for row in csv.reader(text.splitlines()):
+        if not row or row[0].strip().lower() == CONF_TRACKING_NUMBER:
+            continue
+        yield row[0], row[1] if len(row) > 1 else None
+
+
+def _collect_packages(
+    rows: Iterable[tuple[str, str | None]],
+) -> dict[str, str | None]:
+    """Normalize tracking numbers, the first row of a duplicate wins."""
+    packages: dict[str, str | None] = {}
+    for tracking_number, package_name in rows:
+        if tracking_number := tracking_number.strip().upper():
+            packages.setdefault(tracking_number, (package_name or "").strip() or None)
+    return packages
+
+
+def _import_error(exception: AnjunExpressApiClientError) -> str:
+    """Map a validation failure to the error keys of the config flow."""
+    if isinstance(exception, AnjunExpressApiClientTrackingNotFoundError):
+        return "tracking_not_found"
+    if isinstance(exception, AnjunExpressApiClientCommunicationError):
+        return "connection"
+    LOGGER.error("Unexpected error validating a package: %s", exception)
+    return "unknown"
+
+
+async def _async_import(
+    hass: HomeAssistant,
+    packages: dict[str, str | None],
+) -> ServiceResponse:
+    """Validate packages concurrently and create their entries in one pass."""
+    failed: dict[str, str] = {}
+    for tracking_number in packages:
+        if hass.config_entries.async_entry_for_domain_unique_id(
+            DOMAIN, tracking_number
+        ):
+            failed[tracking_number] = "already_configured"
+
+    # Validated payloads are cached so entry setup does not fetch them again
+    hub = async_get_hub(hass)
+    await hub.cache.async_load()
+    valid: list[str] = []
+    pending = [
+        tracking_number for tracking_number in packages if tracking_number not in failed
+    ]
+    async for tracking_number, result in hub.client.async_get_tracking_data_bulk(
+        pending, MAX_CONCURRENT_REQUESTS
+    ):
+        if isinstance(result, AnjunExpressApiClientError):
+            failed[tracking_number] = _import_error(result)
+            continue
+        hub.cache.async_set(tracking_number, result)
+        valid.append(tracking_number)
+
+    results = await asyncio.gather(
+        *(
+            hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": SOURCE_IMPORT},
+                data={
+                    CONF_TRACKING_NUMBER: tracking_number,
+                    CONF_PACKAGE_NAME: packages[tracking_number] or tracking_number,
+                },
+            )
+            for tracking_number in valid
+        )
+    )
+    added = []
+    for tracking_number, result in zip(valid, results, strict=True):
+        if result["type"] is FlowResultType.ABORT:
+            failed[tracking_number] = result["reason"]
+        else:
+            added.append(tracking_number)
+
+    return {"added": added, "failed": failed}
@@ -0,0 +1,172 @@
+"""Stall detection for Anjun Express."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.components.persistent_notification import (
+    async_create,
+    async_dismiss,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import EVENT_STALLED, STALL_THRESHOLDS
+from .helpers import LazyMinHeap, ListenerRegistry
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .classifier import TrackingStage
+    from .model import TrackingSnapshot
+
+
+class AnjunExpressStallDetector(ListenerRegistry):
+    """
+    Notice packages that stopped moving.
+
+    Every package has a deadline, its latest event plus the threshold of its
+    stage. All deadlines share one heap and a single timer set for the
+    earliest one, so an update costs O(log n) and nothing scans every package.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the stall detector."""
+        super().__init__()
+        self.hass = hass
+        # Latest stage and event of every package, by tracking number
+        self._packages: dict[str, tuple[TrackingStage, datetime]] = {}
+        self._package_names: dict[str, str] = {}
+        self._deadlines = LazyMinHeap()
+        self._stalled: set[str] = set()
+        self._unsub_deadline: CALLBACK_TYPE | None = None
+        self._deadline_at: datetime | None = None
+
+    @callback
+    def async_update(
+        self,
+        tracking_number: str,
+        package_name: str,
+        snapshot: TrackingSnapshot | None,
+    ) -> None:
+        """Move the deadline of a package after its snapshot changed."""
+        latest = snapshot.latest if snapshot else None
+        if (
+            latest is None
+            or latest.timestamp is None
+            or latest.stage not in STALL_THRESHOLDS
+        ):
+            self.async_remove(tracking_number)
+            return
+
+        # A renamed package did not move, it must not be announced again
+        self._package_names[tracking_number] = package_name
+        package = (latest.stage, latest.timestamp)
+        if (previous := self._packages.get(tracking_number)) == package:
+            return
+        self._packages[tracking_number] = package
+        changed = self._clear(tracking_number)
+
+        deadline = latest.timestamp + timedelta(hours=STALL_THRESHOLDS[latest.stage])
+        if deadline <= dt_util.utcnow():
+            # Packages already stalled at startup are not announced again
+            self._stall(tracking_number, announce=previous is not None)
+            changed = True
+        else:
+            self._deadlines.set(tracking_number, deadline)
+        self._schedule_deadline()
+        if changed:
+            self.async_update_listeners()
+
+    @callback
+    def async_remove(self, tracking_number: str) -> None:
+        """Stop watching a package."""
+        self._packages.pop(tracking_number, None)
+        self._package_names.pop(tracking_number, None)
+        changed = self._clear(tracking_number)
+        self._schedule_deadline()
+        if changed:
+            self.async_update_listeners()
+
+    @callback
+    def async_rename(self, tracking_number: str, package_name: str) -> None:
+        """Use a new package name in the next stall announcement."""
+        if tracking_number in self._package_names:
+            self._package_names[tracking_number] = package_name
+
+    @callback
+    def async_stalled(self) -> set[str]:
+        """Return the tracking numbers of stalled packages."""
+        return self._stalled
+
+    def _clear(self, tracking_number: str) -> bool:
+        """Drop the deadline and stall of a package, return if it was stalled."""
+        self._deadlines.remove(tracking_number)
+        if tracking_number not in self._stalled:
+            return False
+        self._stalled.discard(tracking_number)
+        async_dismiss(self.hass, _notification_id(tracking_number))
+        return True
+
+    def _stall(self, tracking_number: str, *, announce: bool = True) -> None:
+        """Mark a package as stalled and tell the user."""
+        self._stalled.add(tracking_number)
+        if not announce:
+            return
+        package_name = self._package_names[tracking_number]
+        stage, moved = self._packages[tracking_number]
+        self.hass.bus.async_fire(
+            EVENT_STALLED,
+            {
+                "tracking_number": tracking_number,
+                "package_name": package_name,
+                "stage": stage,
+                "last_event": moved.isoformat(),
+                "threshold_hours": STALL_THRESHOLDS[stage],
+            },
+        )
+
+        async_create(
+            hass=self.hass,
+            message=f"""**Stage:** {stage}
+**Last event:** {dt_util.as_local(moved).strftime("%Y-%m-%d %H:%M")}
+**Tracking:** {tracking_number}
+
+Your package has not moved for over {STALL_THRESHOLDS[stage]} hours.""",
+            title=f"📦 Package Stalled: {package_name}",
+            notification_id=_notification_id(tracking_number),
+        )
+
+    def _schedule_deadline(self) -> None:
+        """Wake up at the earliest deadline only."""
+        earliest = self._deadlines.peek()
+        deadline = earliest[0] if earliest else None
+        if deadline == self._deadline_at:
+            return
+        if self._unsub_deadline is not None:
+            self._unsub_deadline()
+            self._unsub_deadline = None
+        self._deadline_at = deadline
+        if deadline is not None:
+            self._unsub_deadline = async_track_point_in_utc_time(
+                self.hass, self._async_deadline_reached, deadline
+            )
+
+    @callback
+    def _async_deadline_reached(self, now: datetime) -> None:
+        """Stall every package past its deadline."""
+        self._unsub_deadline = None
+        self._deadline_at = None
+        due = self._deadlines.pop_due(now)
+        for tracking_number in due:
+            self._stall(tracking_number)
+        self._schedule_deadline()
+        if due:
+            self.async_update_listeners()
+
+
+def _notification_id(tracking_number: str) -> str:
+    """Return the stall notification ID of a package."""
+    return f"anjun_{tracking_number.lower()}_stalled"
@@ -0,0 +1,142 @@
+"""Request throttling for the Anjun Express API."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from enum import StrEnum
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Return an exponential backoff delay with full jitter."""
+    return random.uniform(0, min(maximum, base * 2**attempt))  # noqa: S311
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every request of the client.
+
+    A caller short of a token reserves one ahead, letting the balance go
+    negative, and sleeps until it is due. No lock is held while waiting, so
+    a long wait never blocks the other callers.
+    """
+
+    def __init__(self, rate: float, capacity: int, max_pause: float) -> None:
+        """Initialize the bucket with `rate` tokens per second."""
+        self._rate = rate
+        self._capacity = capacity
+        self._max_pause = max_pause
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    @property
+    def paused_for(self) -> float:
+        """Return the seconds left before requests may be sent again."""
+        return max(self._paused_until - time.monotonic(), 0.0)
+
+    def pause(self, seconds: float) -> None:
+        """Refuse every request for a while, as asked by Retry-After."""
+        seconds = min(seconds, self._max_pause)
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def async_acquire(self) -> bool:
+        """Wait until a request may be sent, return False while paused."""
+        now = time.monotonic()
+        if now < self._paused_until:
+            return False
+
+        self._tokens = min(
+            self._capacity,
+            self._tokens + (now - self._updated) * self._rate,
+        )
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            try:
+                await asyncio.sleep(-self._tokens / self._rate)
+            except asyncio.CancelledError:
+                self._tokens += 1
+                raise
+        # The API may have asked to pause while this caller waited
+        return time.monotonic() >= self._paused_until
+
+
+class CircuitState(StrEnum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop calling the API after repeated failures."""
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        max_reset_timeout: float,
+    ) -> None:
+        """Initialize the breaker."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._max_reset_timeout = max_reset_timeout
+        self._failures = 0
+        self._trips = 0
+        self._opened_until = 0.0
+        self._trial_started: float | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the current state."""
+        if self._failures < self._failure_threshold:
+            return CircuitState.CLOSED
+        if time.monotonic() < self._opened_until:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds left before the breaker allows a trial."""
+        return max(self._opened_until - time.monotonic(), 0.0)
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.OPEN:
+            return False
+        # Half open, let a single request probe the API. A probe that never
+        # reported back does not block the circuit forever.
+        now = time.monotonic()
+        if (
+            self._trial_started is not None
+            and now - self._trial_started < self._reset_timeout
+        ):
+            return False
+        self._trial_started = now
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self._failures = 0
+        self._trips = 0
+        self._trial_started = None
+
+    def record_failure(self) -> None:
+        """Count a failure and open the circuit when over the threshold."""
+        self._failures += 1
+        self._trial_started = None
+        if self._failures < self._failure_threshold:
+            return
+
+        # Every trip in a row keeps the circuit open for longer
+        timeout = self._reset_timeout + backoff_delay(
+            self._trips, self._reset_timeout, self._max_reset_timeout
+        )
+        self._trips += 1
+        self._opened_until = time.monotonic() + timeout
@@ -0,0 +1 @@
+"""Tests for the Anjun Express integration."""
@@ -0,0 +1,67 @@
+"""Fixtures for Anjun Express tests."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.anjun_express.api import AnjunExpressApiClient
+from custom_components.anjun_express.const import (
+    CONF_PACKAGE_NAME,
+    CONF_TRACKING_NUMBER,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from unittest.mock import AsyncMock
+
+TRACKING_NUMBER = "AJ123456789CN"
+
+TRACKING_PAYLOAD: dict[str, Any] = {
+    "shippingCompany": [
+        {
+            "date": "2025-01-02T10:00:00Z",
+            "status": "In transit",
+            "address": "Shenzhen",
+            "remark": None,
+        },
+    ],
+    "clCollectOrder": {},
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    enable_custom_integrations: None,  # noqa: ARG001
+) -> None:
+    """Enable the custom integration in every test."""
+    return
+
+
+@pytest.fixture
+def mock_tracking_data() -> Generator[AsyncMock]:
+    """Answer tracking requests without touching the network."""
+    with patch.object(
+        AnjunExpressApiClient,
+        "async_get_tracking_data",
+        return_value=TRACKING_PAYLOAD,
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture
+def config_entry() -> MockConfigEntry:
+    """Return a config entry tracking one package."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Headphones",
+        data={
+            CONF_TRACKING_NUMBER: TRACKING_NUMBER,
+            CONF_PACKAGE_NAME: "Headphones",
+        },
+        unique_id=TRACKING_NUMBER,
+    )
@@ -0,0 +1,127 @@
+"""Tests for the Anjun Express delivery analytics."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.anjun_express.analytics import AnjunExpressAnalytics
+from custom_components.anjun_express.classifier import TrackingStage
+from custom_components.anjun_express.model import TrackingEvent
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+HOUR = 3600.0
+START = datetime(2025, 1, 1, tzinfo=UTC)
+STARTED = START.timestamp()
+
+
+def _event(stage: TrackingStage, hours: float) -> TrackingEvent:
+    """Return an event entering a stage some hours after the start."""
+    return TrackingEvent(
+        date=None,
+        status=None,
+        location=None,
+        remark=None,
+        timestamp=START + timedelta(hours=hours),
+        stage=stage,
+        fingerprint=0,
+    )
+
+
+@pytest.fixture
+async def analytics(hass: HomeAssistant) -> AnjunExpressAnalytics:
+    """Return analytics loaded from an empty database."""
+    analytics = AnjunExpressAnalytics(hass)
+    with patch.object(AnjunExpressAnalytics, "_open", return_value=[]):
+        await analytics.async_load()
+    return analytics
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_earlier_entry_moves_durations(
+    analytics: AnjunExpressAnalytics,
+) -> None:
+    """An earlier stage entry replaces the durations of the later one."""
+    analytics.async_record(
+        "A", [_event(TrackingStage.POSTED, 0), _event(TrackingStage.DELIVERED, 10)]
+    )
+    analytics.async_record(
+        "B", [_event(TrackingStage.POSTED, 0), _event(TrackingStage.DELIVERED, 4)]
+    )
+    stats = analytics.async_get_stats(TrackingStage.POSTED, TrackingStage.DELIVERED)
+    assert (stats.count, stats.median) == (2, 7 * HOUR)
+
+    # The 10 hour sample of A becomes 20 hours
+    analytics.async_record("A", [_event(TrackingStage.POSTED, -10)])
+    stats = analytics.async_get_stats(TrackingStage.POSTED, TrackingStage.DELIVERED)
+    assert (stats.count, stats.median, stats.p90) == (2, 12 * HOUR, 4 * HOUR)
+
+    # Moving the later stage shortens it again
+    analytics.async_record("A", [_event(TrackingStage.DELIVERED, -8)])
+    stats = analytics.async_get_stats(TrackingStage.POSTED, TrackingStage.DELIVERED)
+    assert (stats.count, stats.median, stats.p90) == (2, 3 * HOUR, 2 * HOUR)
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_later_entry_is_ignored(analytics: AnjunExpressAnalytics) -> None:
+    """A stage keeps the time it was first entered."""
+    analytics.async_record(
+        "A", [_event(TrackingStage.POSTED, 0), _event(TrackingStage.DELIVERED, 10)]
+    )
+    updates = []
+    analytics.async_add_listener(lambda: updates.append(None))
+
+    analytics.async_record("A", [_event(TrackingStage.POSTED, 5)])
+
+    stats = analytics.async_get_stats(TrackingStage.POSTED, TrackingStage.DELIVERED)
+    assert (stats.count, stats.median) == (1, 10 * HOUR)
+    assert updates == []
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_out_of_order_entry_becomes_a_sample(
+    analytics: AnjunExpressAnalytics,
+) -> None:
+    """A negative duration is left out until an earlier entry fixes it."""
+    analytics.async_record("A", [_event(TrackingStage.DELIVERED, 2)])
+    analytics.async_record("A", [_event(TrackingStage.IN_TRANSIT, 3)])
+    stats = analytics.async_get_stats(TrackingStage.IN_TRANSIT, TrackingStage.DELIVERED)
+    assert stats.count == 0
+
+    analytics.async_record("A", [_event(TrackingStage.IN_TRANSIT, 1)])
+    stats = analytics.async_get_stats(TrackingStage.IN_TRANSIT, TrackingStage.DELIVERED)
+    assert (stats.count, stats.median) == (1, HOUR)
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_load_from_rows(hass: HomeAssistant) -> None:
+    """Stored stage entries are loaded into sorted transition durations."""
+    rows = [
+        ("A", "posted", STARTED),
+        ("A", "delivered", STARTED + 3 * HOUR),
+        ("B", "posted", STARTED),
+        ("B", "in_transit", STARTED + HOUR),
+        ("B", "delivered", STARTED + 2 * HOUR),
+        # Stages outside the lifecycle are not kept
+        ("C", "exception", STARTED),
+    ]
+    analytics = AnjunExpressAnalytics(hass)
+    with patch.object(AnjunExpressAnalytics, "_open", return_value=rows):
+        await analytics.async_load()
+
+    assert analytics.async_knows("B")
+    assert not analytics.async_knows("C")
+    stats = analytics.async_get_stats(TrackingStage.POSTED, TrackingStage.DELIVERED)
+    assert (stats.count, stats.median) == (2, 2.5 * HOUR)
+    stats = analytics.async_get_stats(TrackingStage.IN_TRANSIT, TrackingStage.DELIVERED)
+    assert (stats.count, stats.median) == (1, HOUR)
+
+    # Recorded events update the loaded durations in place
+    analytics.async_record("B", [_event(TrackingStage.POSTED, -2)])
+    stats = analytics.async_get_stats(TrackingStage.POSTED, TrackingStage.DELIVERED)
+    assert (stats.count, stats.median, stats.p90) == (2, 3.5 * HOUR, 3 * HOUR)
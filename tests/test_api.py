@@ -0,0 +1,58 @@
+"""Tests for the Anjun Express API client."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.anjun_express.api import (
+    AnjunExpressApiClientError,
+    _parse_retry_after,
+    _project_tracking_payload,
+)
+
+
+def test_project_skips_malformed_events() -> None:
+    """Events that are not objects are dropped instead of failing."""
+    payload = {
+        "shippingCompany": [
+            None,
+            "lost",
+            {"date": "2025-01-02T10:00:00Z", "status": "Posted", "extra": 1},
+        ],
+        "clCollectOrder": {"city": "Shenzhen", "empty": ""},
+    }
+
+    assert _project_tracking_payload(payload) == {
+        "shippingCompany": [
+            {
+                "date": "2025-01-02T10:00:00Z",
+                "status": "Posted",
+                "address": None,
+                "remark": None,
+            }
+        ],
+        "clCollectOrder": {"city": "Shenzhen"},
+    }
+
+
+@pytest.mark.parametrize("payload", [None, [], "tracking"])
+def test_project_rejects_unexpected_payload(payload: object) -> None:
+    """A payload that is not an object is an API error."""
+    with pytest.raises(AnjunExpressApiClientError):
+        _project_tracking_payload(payload)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("120", 120.0),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+        # No zone at all, RFC 5322 reads it as UTC
+        ("Wed, 21 Oct 2015 07:28:00 -0000", 0.0),
+        ("soon", None),
+        (None, None),
+    ],
+)
+def test_parse_retry_after(value: str | None, expected: float | None) -> None:
+    """Retry-After is read as seconds or as a date, past dates wait nothing."""
+    assert _parse_retry_after(value) == expected
@@ -0,0 +1,57 @@
+"""Tests for the Anjun Express sensors."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.const import STATE_UNKNOWN
+
+from .conftest import TRACKING_NUMBER
+
+if TYPE_CHECKING:
+    from unittest.mock import AsyncMock
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_analytics_sensors(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_tracking_data: AsyncMock,  # noqa: ARG001
+) -> None:
+    """The shared analytics sensors are set up without any history."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.anjun_median_transit_time")
+    assert state is not None
+    assert state.state == STATE_UNKNOWN
+    assert state.attributes["samples"] == 0
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_fleet_sensors(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_tracking_data: AsyncMock,  # noqa: ARG001
+) -> None:
+    """The fleet sensors count the tracked packages."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.anjun_packages_in_transit").state == "1"
+    assert hass.states.get("sensor.anjun_packages_delivered").state == "0"
+
+    # The only event is far older than the in transit threshold
+    state = hass.states.get("sensor.anjun_stalled_packages")
+    assert state.state == "1"
+    assert state.attributes["tracking_numbers"] == [TRACKING_NUMBER]
+
+    state = hass.states.get("sensor.anjun_oldest_package_in_transit")
+    assert state.state == "2025-01-02T10:00:00+00:00"
+    assert state.attributes["tracking_number"] == TRACKING_NUMBER
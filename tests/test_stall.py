@@ -0,0 +1,30 @@
+"""Tests for the Anjun Express stall detector."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.anjun_express.const import EVENT_STALLED
+from custom_components.anjun_express.model import TrackingSnapshot
+from custom_components.anjun_express.stall import AnjunExpressStallDetector
+
+from .conftest import TRACKING_NUMBER, TRACKING_PAYLOAD
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+async def test_rename_does_not_announce_again(hass: HomeAssistant) -> None:
+    """Renaming a stalled package keeps it stalled without a new event."""
+    events = async_capture_events(hass, EVENT_STALLED)
+    detector = AnjunExpressStallDetector(hass)
+    snapshot = TrackingSnapshot.from_payload(TRACKING_PAYLOAD)
+
+    detector.async_update(TRACKING_NUMBER, "Headphones", snapshot)
+    detector.async_update(TRACKING_NUMBER, "Earbuds", snapshot)
+    await hass.async_block_till_done()
+
+    assert detector.async_stalled() == {TRACKING_NUMBER}
+    assert events == []